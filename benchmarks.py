@@ -0,0 +1,289 @@
+"""
+Headless benchmark suite for the simulator's hot paths.
+
+    python benchmarks.py run --output bench.json
+    python benchmarks.py compare baseline.json bench.json --tolerance 0.10
+    python benchmarks.py startup
+
+"run" times micro-benchmarks of single CatanSimulation methods (nanoseconds per
+call), macro-benchmarks of whole games and batches (games per second) and the
+startup time of fresh interpreters importing the simulators (milliseconds), and
+writes them to a JSON file. "startup" prints only the startup times. "compare" checks a results file against a stored
+baseline and exits with status 1 if any benchmark got slower by more than the
+tolerance. No pygame display is opened.
+"""
+import argparse
+import importlib.machinery
+import importlib.util
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+import timeit
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+BENCHMARK_SEED = 2024  # Fixed, so every run times the same games
+
+# Startup benchmarks: code run by a fresh interpreter in this directory. The "+" entries
+# also import the libraries the simulators used to import eagerly, to show what that costs.
+STARTUP_SNIPPETS = {
+    "python": "pass",
+    "simulation": "import benchmarks; benchmarks.load_simulation()",
+    "simulation+pygame": "import benchmarks; benchmarks.load_simulation(); import pygame",
+    "decision_tree": "import benchmarks; benchmarks.load_script('14decisiontree2')",
+    "decision_tree+analysis": "import benchmarks; benchmarks.load_script('14decisiontree2'); "
+                              "import matplotlib.pyplot, pandas, sklearn.model_selection, sklearn.tree",
+}
+
+
+def load_simulation():
+    """
+    Imports finalVersionSimulationRun (a script without a .py extension) as a module.
+    """
+    return load_script("finalVersionSimulationRun")
+
+
+def load_script(name):
+    """
+    Imports one of the repository's extension-less scripts as a module of the same name.
+    Its __main__ block does not run.
+    """
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    if HERE not in sys.path:
+        sys.path.insert(0, HERE)
+    loader = importlib.machinery.SourceFileLoader(name, os.path.join(HERE, name))
+    spec = importlib.util.spec_from_loader(loader.name, loader)
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[loader.name] = module
+    loader.exec_module(module)
+    return module
+
+
+def benchmark_board(sim_module):
+    """
+    Returns the board layout and resource values of the script's default run (its DEFAULT_CONFIG).
+    """
+    return sim_module.BOARD_LAYOUT, sim_module.DEFAULT_CONFIG['resource_values']
+
+
+def time_call(function, repeat=5):
+    """
+    Times a zero-argument callable and returns the best of several runs (each at
+    least 0.2 s long) in nanoseconds per call.
+    """
+    timer = timeit.Timer(function)
+    number, _ = timer.autorange()
+    return min(timer.repeat(repeat=repeat, number=number)) / number * 1e9
+
+
+def mid_game(sim_module, board_layout, resource_values):
+    """
+    Builds a simulation in a typical mid-game state, three settlements each with their
+    starting roads, so the micro-benchmarks see realistic work.
+    """
+    simulation = sim_module.CatanSimulation(board_layout, 100, resource_values, 0, seed=BENCHMARK_SEED)
+    simulation.reset_game()
+    for _ in range(3):
+        for player in (1, 2):
+            location = simulation.choose_settlement_by_most_common_roll(player, simulation.settlements[player])
+            simulation.place_settlement(player, location)
+            simulation.place_starting_road(player, location)
+    return simulation
+
+
+def micro_benchmarks(sim_module, board_layout, resource_values):
+    """
+    Times single CatanSimulation methods. trade_with_bank and deduct_resources reset
+    the hand inside the timed call, so every call does the same work.
+    """
+    simulation = mid_game(sim_module, board_layout, resource_values)
+    results = {}
+
+    results["produce_resources"] = time_call(lambda: simulation.produce_resources(8))
+    open_vertex = simulation.get_available_locations()[0]
+    results["is_valid_settlement_location"] = time_call(
+        lambda: simulation.is_valid_settlement_location(open_vertex, 1))
+
+    strategies = {
+        "most_common_roll": simulation.choose_settlement_by_most_common_roll,
+        "most_valuable_resource": simulation.choose_settlement_by_most_valuable_resource,
+        "missing_resource": simulation.choose_settlement_by_missing_resource,
+        "expected_yield": simulation.choose_settlement_by_expected_yield,
+        "rollout": simulation.choose_settlement_by_rollout,
+    }
+    simulation.inventory[1] = [1, 0, 3, 0, 2]  # Missing brick and wheat
+    for name, strategy in strategies.items():
+        placed = simulation.settlements[1]
+        results[f"choose_settlement_by_{name}"] = time_call(lambda strategy=strategy, placed=placed: strategy(1, placed))
+
+    network = simulation.network[1]
+    results["choose_road_location"] = time_call(lambda: simulation.choose_road_location(1, network))
+    first_road = simulation.roads[1][0]
+    results["update_road_component"] = time_call(lambda: simulation.update_road_component(1, first_road))
+
+    inventory = simulation.inventory[1]
+    hand = [5, 0, 1, 1, 0]  # Cannot build, holds 4+ wood: trades every call
+
+    def trade():
+        inventory[:] = hand
+        simulation.trade_with_bank(1)
+    results["trade_with_bank"] = time_call(trade)
+
+    def deduct():
+        inventory[:] = hand
+        simulation.deduct_resources(1, {'wood': 1, 'brick': 1, 'sheep': 1, 'wheat': 1})
+    results["deduct_resources"] = time_call(deduct)
+    return {f"micro.{name}": {"value": value, "unit": "ns/call", "higher_is_better": False}
+            for name, value in results.items()}
+
+
+def macro_benchmarks(sim_module, board_layout, resource_values, games_per_pairing=50, batch_sizes=(1000, 10000)):
+    """
+    Times full 100-turn games for every strategy pairing, then whole batches.
+    """
+    results = {}
+    strategies = sorted(sim_module.STRATEGY_MAPPING)
+    for first in strategies:
+        for second in strategies:
+            start = time.perf_counter()
+            for game_index in range(games_per_pairing):
+                seed = sim_module.derive_game_seed(BENCHMARK_SEED, game_index)
+                simulation = sim_module.CatanSimulation(board_layout, 100, resource_values, 0, seed=seed)
+                simulation.run_simulation(first, second, show_results=False)
+            elapsed = time.perf_counter() - start
+            name = f"macro.game.{sim_module.STRATEGY_MAPPING[first]}_vs_{sim_module.STRATEGY_MAPPING[second]}"
+            results[name] = games_per_pairing / elapsed
+
+    engines = ["python"]
+    if importlib.util.find_spec("numpy") is not None:
+        engines.append("vector")
+    for engine in engines:
+        for n_games in batch_sizes:
+            start = time.perf_counter()
+            sim_module.run_batch(board_layout, n_games, (1, 2), seed=BENCHMARK_SEED, resource_values=resource_values,
+                                 engine=engine, road_network=engine != "vector")
+            results[f"macro.batch.{engine}.{n_games}"] = n_games / (time.perf_counter() - start)
+    return {name: {"value": value, "unit": "games/s", "higher_is_better": True} for name, value in results.items()}
+
+
+def time_startup(code, repeat=5):
+    """
+    Runs code in fresh interpreters and returns the best wall time in milliseconds.
+    """
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, "-c", code], cwd=HERE, check=True,
+                       env=dict(os.environ, SDL_VIDEODRIVER="dummy", PYGAME_HIDE_SUPPORT_PROMPT="1"))
+        times.append(time.perf_counter() - start)
+    return min(times) * 1e3
+
+
+def startup_benchmarks(repeat=5):
+    """
+    Times fresh interpreters importing the simulators, with and without the libraries
+    they only need for drawing and analysis. Snippets whose libraries are not
+    installed are skipped.
+    """
+    results = {}
+    for name, code in STARTUP_SNIPPETS.items():
+        try:
+            results[name] = time_startup(code, repeat)
+        except subprocess.CalledProcessError:
+            print(f"Skipping startup.{name}: it failed in a fresh interpreter")
+    return {f"startup.{name}": {"value": value, "unit": "ms", "higher_is_better": False}
+            for name, value in results.items()}
+
+
+def run_suite(output, quick=False):
+    """
+    Runs every benchmark and writes the results file.
+
+    Args:
+        output (str): Path of the JSON results file.
+        quick (bool): Use fewer games, for a fast smoke run.
+    """
+    sim_module = load_simulation()
+    board_layout, resource_values = benchmark_board(sim_module)
+    benchmarks = micro_benchmarks(sim_module, board_layout, resource_values)
+    if quick:
+        benchmarks.update(macro_benchmarks(sim_module, board_layout, resource_values, 5, (100,)))
+    else:
+        benchmarks.update(macro_benchmarks(sim_module, board_layout, resource_values))
+    benchmarks.update(startup_benchmarks(2 if quick else 5))
+    report = {
+        "meta": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "quick": quick,
+        },
+        "benchmarks": benchmarks,
+    }
+    with open(output, "w") as file:
+        json.dump(report, file, indent=2, sort_keys=True)
+    for name, result in sorted(benchmarks.items()):
+        print(f"{name:<60} {result['value']:>14.1f} {result['unit']}")
+    print(f"Wrote {output}")
+
+
+def compare(baseline_path, current_path, tolerance=0.10):
+    """
+    Prints the change of every benchmark present in both files and flags those that
+    got slower by more than the tolerance.
+
+    Args:
+        baseline_path (str): The stored baseline results file.
+        current_path (str): The results file to check.
+        tolerance (float): Allowed slowdown as a fraction, e.g. 0.10 for 10%.
+
+    Returns:
+        list: Names of the regressed benchmarks.
+    """
+    with open(baseline_path) as file:
+        baseline = json.load(file)["benchmarks"]
+    with open(current_path) as file:
+        current = json.load(file)["benchmarks"]
+
+    regressions = []
+    for name in sorted(set(baseline) & set(current)):
+        old = baseline[name]["value"]
+        new = current[name]["value"]
+        # Speed-up factor: > 1 is faster whatever the unit
+        speedup = new / old if current[name]["higher_is_better"] else old / new
+        flag = ""
+        if speedup < 1 - tolerance:
+            flag = "REGRESSION"
+            regressions.append(name)
+        elif speedup > 1 + tolerance:
+            flag = "faster"
+        print(f"{name:<60} {old:>14.1f} -> {new:>14.1f} {current[name]['unit']:<8} x{speedup:5.2f} {flag}")
+    for name in sorted(set(baseline) - set(current)):
+        print(f"{name:<60} missing from {current_path}")
+    print(f"{len(regressions)} regression(s) beyond {tolerance:.0%}")
+    return regressions
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the Catan simulator.")
+    commands = parser.add_subparsers(dest="command", required=True)
+    run_parser = commands.add_parser("run", help="run the benchmarks and write a results file")
+    run_parser.add_argument("--output", default="bench.json", help="results file (JSON)")
+    run_parser.add_argument("--quick", action="store_true", help="fewer games, for a fast smoke run")
+    compare_parser = commands.add_parser("compare", help="flag regressions against a baseline results file")
+    compare_parser.add_argument("baseline", help="stored baseline results file")
+    compare_parser.add_argument("current", help="results file to check")
+    compare_parser.add_argument("--tolerance", type=float, default=0.10, help="allowed slowdown (fraction)")
+    startup_parser = commands.add_parser("startup", help="print how long fresh interpreters take to import")
+    startup_parser.add_argument("--repeat", type=int, default=5, help="interpreters started per snippet")
+    args = parser.parse_args()
+
+    if args.command == "run":
+        run_suite(args.output, args.quick)
+    elif args.command == "startup":
+        for name, result in startup_benchmarks(args.repeat).items():
+            print(f"{name:<60} {result['value']:>14.1f} {result['unit']}")
+    else:
+        sys.exit(1 if compare(args.baseline, args.current, args.tolerance) else 0)
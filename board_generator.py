@@ -0,0 +1,96 @@
+"""
+Seeded random board layouts with the standard tile and number-token distribution.
+
+A board is dealt like the physical game: the resource tiles are shuffled over the
+hexes, then the number tokens over every hex but the desert, which gets the robber's
+7 like the hard-coded board in finalVersionSimulationRun. The same seed always deals
+the same board.
+"""
+import random
+
+from board_topology import HEX_DIRECTIONS
+
+# The 19 hexes of the base game: radius 2 around (2, 2) with the HEX_DIRECTIONS neighbours
+STANDARD_COORDS = [(x, y) for x in range(5) for y in range(5) if abs(x - y) <= 2]
+STANDARD_RESOURCES = {'wood': 4, 'brick': 3, 'sheep': 4, 'wheat': 4, 'ore': 3, 'desert': 1}
+STANDARD_NUMBERS = [2, 3, 3, 4, 4, 5, 5, 6, 6, 8, 8, 9, 9, 10, 10, 11, 11, 12]
+RED_NUMBERS = (6, 8)  # The most likely rolls, kept apart by separate_red_numbers
+DESERT_NUMBER = 7
+MAX_DEALS = 10000  # Red-number deals tried before giving up
+
+
+def standard_template():
+    """
+    Returns a board layout with the standard coordinates, resources and numbers (in
+    no particular arrangement), for use as generate_board's template.
+    """
+    resources = [resource for resource, count in STANDARD_RESOURCES.items() for _ in range(count)]
+    numbers = iter(STANDARD_NUMBERS)
+    return {coords: {'resource': resource, 'number': DESERT_NUMBER if resource == 'desert' else next(numbers)}
+            for coords, resource in zip(STANDARD_COORDS, resources)}
+
+
+def generate_board(seed, template=None, separate_red_numbers=False):
+    """
+    Deals a random board.
+
+    Args:
+        seed (int or str): Seed of the deal.
+        template (dict): A board layout whose coordinates, resource tiles and number
+            tokens are reshuffled; None uses the standard 19-hex board.
+        separate_red_numbers (bool): Deal the 6s and 8s so that no two of them are on
+            neighbouring hexes.
+
+    Returns:
+        dict: A board layout, {(x, y): {'resource': ..., 'number': ...}}.
+
+    Raises:
+        ValueError: If separate_red_numbers cannot be met within MAX_DEALS deals.
+    """
+    if template is None:
+        template = standard_template()
+    rng = random.Random(seed)
+    coords = sorted(template)
+    resources = sorted(tile['resource'] for tile in template.values())
+    numbers = sorted(tile['number'] for tile in template.values() if tile['resource'] != 'desert')
+
+    rng.shuffle(resources)
+    numbered = [tile for tile, resource in zip(coords, resources) if resource != 'desert']
+    if separate_red_numbers:
+        placement = deal_separated_numbers(numbered, numbers, rng)
+    else:
+        rng.shuffle(numbers)
+        placement = dict(zip(numbered, numbers))
+
+    return {tile: {'resource': resource, 'number': placement.get(tile, DESERT_NUMBER)}
+            for tile, resource in zip(coords, resources)}
+
+
+def deal_separated_numbers(tiles, numbers, rng):
+    """
+    Deals number tokens so that no two RED_NUMBERS tokens are on neighbouring hexes:
+    the hexes for the red tokens are drawn until they are pairwise apart, then the
+    other tokens are shuffled over the remaining hexes.
+
+    Args:
+        tiles (list): The (x, y) hexes that take a token.
+        numbers (list): The tokens, one per hex.
+        rng (random.Random): Source of the deal.
+
+    Returns:
+        dict: {(x, y): number}.
+    """
+    red = [number for number in numbers if number in RED_NUMBERS]
+    other = [number for number in numbers if number not in RED_NUMBERS]
+    for _ in range(MAX_DEALS):
+        red_tiles = rng.sample(tiles, len(red))
+        taken = set(red_tiles)
+        if not any((x + dx, y + dy) in taken for x, y in red_tiles for dx, dy in HEX_DIRECTIONS):
+            break
+    else:
+        raise ValueError(f"Could not separate the {len(red)} red number tokens in {MAX_DEALS} deals")
+    rng.shuffle(red)
+    rng.shuffle(other)
+    placement = dict(zip(red_tiles, red))
+    placement.update(zip([tile for tile in tiles if tile not in taken], other))
+    return placement
@@ -0,0 +1,261 @@
+"""
+Pygame drawing of CatanSimulation boards: offscreen PNG snapshots and an event viewer.
+
+The hexes and number tokens of a board never change during a game, so they are drawn
+once per board into a cached background surface, and every frame only blits it and
+draws the roads and buildings. Offscreen rendering never opens a window and uses the
+dummy SDL video driver, so it runs on headless machines. The viewers wait for input
+(or for the next frame of a capped frame rate) instead of polling in a busy loop.
+"""
+import math
+import os
+
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+import pygame
+
+from board_topology import corner_tiles, get_board_topology
+
+TILE_RADIUS = 50  # Radius of each hex tile
+TILE_SPACING = TILE_RADIUS * math.sqrt(3)  # Spacing between tiles
+SCREEN_WIDTH = 800
+SCREEN_HEIGHT = 600
+FONT_SIZE = 16
+BACKGROUND = (135, 206, 250)  # Light blue
+
+COLORS = {
+    'wood': (34, 139, 34),  # Green
+    'brick': (178, 34, 34),  # Red
+    'sheep': (144, 238, 144),  # Light green
+    'wheat': (255, 223, 0),  # Yellow
+    'ore': (169, 169, 169),  # Gray
+    'desert': (210, 180, 140),  # Tan
+    'text': (0, 0, 0),  # Black
+}
+# (settlement, city) colours per player
+PLAYER_COLORS = {
+    1: ((255, 255, 255), (0, 0, 255)),  # White settlements, blue cities
+    2: ((255, 165, 0), (255, 0, 0)),  # Orange settlements, red cities
+    3: ((255, 192, 203), (128, 0, 128)),  # Pink settlements, purple cities
+    4: ((0, 255, 255), (0, 128, 128)),  # Cyan settlements, teal cities
+    5: ((173, 255, 47), (0, 100, 0)),  # Yellow-green settlements, dark green cities
+    6: ((210, 105, 30), (101, 67, 33)),  # Light brown settlements, dark brown cities
+}
+
+_RENDERER_CACHE = {}  # Board contents: BoardRenderer
+
+
+def init_headless():
+    """
+    Prepares pygame for offscreen drawing: the dummy video driver (unless another is
+    configured) and the font module, without opening a window.
+    """
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    if not pygame.font.get_init():
+        pygame.font.init()
+
+
+def board_to_screen(x, y, offset_x, offset_y):
+    """
+    Converts board coordinates to the screen position of the hex's centre.
+    """
+    screen_x = offset_x + x * TILE_SPACING - y * TILE_SPACING // 2
+    screen_y = offset_y + y * TILE_RADIUS * 1.5
+    return screen_x, screen_y
+
+
+def draw_hexagon(surface, color, center, radius):
+    points = [
+        (
+            center[0] + radius * math.cos(math.radians(angle)),
+            center[1] + radius * math.sin(math.radians(angle))
+        )
+        for angle in range(30, 360, 60)  # Pointy-top, so corners line up with the board topology
+    ]
+    pygame.draw.polygon(surface, color, points)
+    pygame.draw.polygon(surface, (0, 0, 0), points, 2)  # Black border
+
+
+class BoardRenderer:
+    """
+    The pre-rendered hexes and number tokens of one board, and the screen position of
+    every vertex, centred in a SCREEN_WIDTH x SCREEN_HEIGHT frame.
+    """
+
+    def __init__(self, board_layout, topology):
+        """
+        Draws the board's tiles into the cached background surface.
+
+        Args:
+            board_layout (dict): A dictionary representing the game board.
+            topology (BoardTopology): The vertex graph of the board.
+        """
+        if not pygame.font.get_init():
+            pygame.font.init()
+        self.topology = topology
+
+        # Centre the board from the unshifted tile centres
+        centers = [board_to_screen(x, y, 0, 0) for x, y in board_layout]
+        offset_x = (SCREEN_WIDTH - (min(x for x, _ in centers) + max(x for x, _ in centers))) // 2
+        offset_y = (SCREEN_HEIGHT - (min(y for _, y in centers) + max(y for _, y in centers))) // 2
+
+        font = pygame.font.Font(None, FONT_SIZE)
+        self.background = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT))
+        self.background.fill(BACKGROUND)
+        for (x, y), tile in board_layout.items():
+            screen_x, screen_y = board_to_screen(x, y, offset_x, offset_y)
+            draw_hexagon(self.background, COLORS[tile['resource']], (screen_x, screen_y), TILE_RADIUS)
+            text = font.render(str(tile['number']), True, COLORS['text'])
+            self.background.blit(text, (screen_x - text.get_width() // 2, screen_y - text.get_height() // 2))
+
+        # Each vertex is drawn at the point where its three hexes meet
+        self.vertex_points = []
+        for x, y, position in topology.vertex_corners:
+            hex_centers = [board_to_screen(tile_x, tile_y, offset_x, offset_y)
+                           for tile_x, tile_y in corner_tiles(x, y, position)]
+            self.vertex_points.append((int(sum(center[0] for center in hex_centers) / 3),
+                                       int(sum(center[1] for center in hex_centers) / 3)))
+
+    def draw(self, surface, settlements, roads=None):
+        """
+        Draws a board position onto a surface.
+
+        Args:
+            surface (pygame.Surface): Where to draw, SCREEN_WIDTH x SCREEN_HEIGHT.
+            settlements (list): Per player ID (slot 0 unused): [(vertex, level)], level 2 for a city.
+            roads (list): Per player ID: edge IDs. None draws no roads.
+        """
+        surface.blit(self.background, (0, 0))
+        points = self.vertex_points
+        if roads is not None:
+            for player, edges in enumerate(roads):
+                for edge in edges:
+                    start, end = self.topology.edge_vertices[edge]
+                    pygame.draw.line(surface, PLAYER_COLORS[player][0], points[start], points[end], 5)
+        for player, buildings in enumerate(settlements):
+            for vertex, level in buildings:
+                pygame.draw.circle(surface, PLAYER_COLORS[player][level - 1], points[vertex], 8)
+
+    def render(self, settlements, roads=None):
+        """
+        Returns a new offscreen surface with a board position drawn on it (see draw).
+        """
+        surface = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT))
+        self.draw(surface, settlements, roads)
+        return surface
+
+
+def get_board_renderer(board_layout, topology=None):
+    """
+    Returns the BoardRenderer for a board, drawing its tiles only the first time the
+    board's tiles and numbers are seen.
+    """
+    key = tuple(sorted((coords, tile['resource'], tile['number']) for coords, tile in board_layout.items()))
+    renderer = _RENDERER_CACHE.get(key)
+    if renderer is None:
+        renderer = BoardRenderer(board_layout, topology or get_board_topology(board_layout))
+        _RENDERER_CACHE[key] = renderer
+    return renderer
+
+
+def simulation_position(simulation):
+    """
+    Returns the (settlements, roads) of a CatanSimulation to draw; placeholder roads
+    are not on the board, so they are left out.
+    """
+    return simulation.settlements, simulation.roads if simulation.road_network else None
+
+
+def save_board_png(simulation, path):
+    """
+    Renders a CatanSimulation's current board offscreen and writes it as a PNG.
+
+    Args:
+        simulation (CatanSimulation): The game to draw.
+        path (str): The image file to write.
+    """
+    init_headless()
+    surface = get_board_renderer(simulation.board, simulation.topology).render(*simulation_position(simulation))
+    pygame.image.save(surface, path)
+
+
+def replayed_position(game):
+    """
+    Returns the (settlements, roads) of an event_log.ReplayedGame to draw.
+    """
+    settlements = [[(vertex, 1) for vertex in game.settlements[player]] +
+                   [(vertex, 2) for vertex in game.cities[player]] for player in range(game.num_players + 1)]
+    return settlements, game.roads
+
+
+def show_frames(frames, caption="Catan Board", fps=None):
+    """
+    Opens a window and shows a sequence of frames. Without fps, the window sleeps in
+    pygame.event.wait until a key: right/space for the next frame, left for the
+    previous one, home/end for the first and last. With fps the frames play
+    automatically at that rate, capped by a pygame clock. Escape or closing the window quits.
+
+    Args:
+        frames (list): Zero-argument callables, each drawing one frame onto the
+            surface given to it.
+        caption (str): The window title; the frame number is appended.
+        fps (float): Frames per second of automatic play, None to step by key.
+    """
+    pygame.init()
+    try:
+        screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
+        clock = pygame.time.Clock()
+        frame = 0
+        drawn = None
+        while True:
+            if frame != drawn:
+                frames[frame](screen)
+                pygame.display.set_caption(f"{caption} ({frame + 1}/{len(frames)})" if len(frames) > 1 else caption)
+                pygame.display.flip()
+                drawn = frame
+            if fps is None:
+                events = [pygame.event.wait()]
+            else:
+                clock.tick(fps)
+                events = pygame.event.get()
+                frame = min(frame + 1, len(frames) - 1)
+            for event in events:
+                if event.type == pygame.QUIT or (event.type == pygame.KEYDOWN and event.key == pygame.K_ESCAPE):
+                    return
+                if event.type == pygame.KEYDOWN:
+                    if event.key in (pygame.K_RIGHT, pygame.K_SPACE):
+                        frame = min(frame + 1, len(frames) - 1)
+                    elif event.key == pygame.K_LEFT:
+                        frame = max(frame - 1, 0)
+                    elif event.key == pygame.K_HOME:
+                        frame = 0
+                    elif event.key == pygame.K_END:
+                        frame = len(frames) - 1
+    finally:
+        pygame.quit()
+
+
+def view_replay(board_layout, events, road_network=True, fps=None):
+    """
+    Steps through a recorded game turn by turn: frame 0 is the board after the
+    placement phase, frame t after turn t.
+
+    Args:
+        board_layout (dict): The game's board; checked against the logged board hash.
+        events: The game's records from an event_log.EventLog (see EventLog.game_events).
+        road_network (bool): Draw the roads; False for placeholder-road games.
+        fps (float): Turns per second of automatic play, None to step by key.
+    """
+    from event_log import board_hash, replay
+
+    game = replay(events)
+    if game.board_hash != board_hash(board_layout):
+        raise ValueError("The recorded game was played on a different board")
+    renderer = get_board_renderer(board_layout)
+    turns = events['turn']
+    frames = []
+    for turn in range(game.turns + 1):
+        position = replayed_position(replay(events[:int(turns.searchsorted(turn, side='right'))]))
+        settlements, roads = position
+        frames.append(lambda surface, settlements=settlements, roads=roads:
+                      renderer.draw(surface, settlements, roads if road_network else None))
+    show_frames(frames, f"Game {game.game_index}", fps)
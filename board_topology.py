@@ -0,0 +1,226 @@
+"""
+Vertex/edge graph of a hex board, shared by the simulation and the pygame display.
+
+Every physical corner of the board gets one integer vertex ID and every hex side
+one integer edge ID, no matter how many hexes share it. The board-only parts of
+the settlement strategies' scores are cached here as well.
+"""
+
+# Neighbouring hex offsets, in the same corner order as CatanSimulation.get_connected_tiles:
+# corner i of hex (x, y) touches (x, y), (x, y) + HEX_DIRECTIONS[i] and (x, y) + HEX_DIRECTIONS[i + 1]
+HEX_DIRECTIONS = [(-1, -1), (-1, 0), (0, 1), (1, 1), (1, 0), (0, -1)]
+
+# Fixed slot order for per-player resource inventories
+RESOURCE_TYPES = ['wood', 'brick', 'sheep', 'wheat', 'ore']
+RESOURCE_INDEX = {resource: index for index, resource in enumerate(RESOURCE_TYPES)}
+
+# One bit per tile resource, for the per-vertex resource masks used by the missing_resource strategy
+RESOURCE_BITS = {resource: 1 << index for index, resource in enumerate(RESOURCE_TYPES + ['desert'])}
+POPCOUNT = [bin(mask).count('1') for mask in range(1 << len(RESOURCE_BITS))]
+
+_TOPOLOGY_CACHE = {}  # Board coordinates: BoardTopology
+_VERTEX_SCORE_CACHE = {}  # (board contents, resource_values): VertexScores
+
+
+def corner_tiles(x, y, position):
+    """
+    Gets the coordinates of the three hexes that meet at a corner.
+
+    Args:
+        x (int): x coordinate of the hex.
+        y (int): y coordinate of the hex.
+        position (int): The corner (0-5) around the hex.
+
+    Returns:
+        list: The (tile_x, tile_y) of the hex itself followed by its two neighbours,
+        or an empty list for an invalid position.
+    """
+    if not 0 <= position < 6:
+        return []  # Invalid position
+    dx1, dy1 = HEX_DIRECTIONS[position]
+    dx2, dy2 = HEX_DIRECTIONS[(position + 1) % 6]
+    return [(x, y), (x + dx1, y + dy1), (x + dx2, y + dy2)]
+
+
+class BoardTopology:
+    """
+    The deduplicated vertex and edge graph of a board layout.
+
+    Tables are plain lists indexed by vertex or edge ID:
+        vertex_corners[v]: one (x, y, position) corner that lies on vertex v
+        vertex_tiles[v]: the on-board (x, y) tiles touching vertex v
+        vertex_neighbours[v]: the vertex IDs one edge away from v
+        vertex_edges[v]: the edge IDs touching v
+        edge_vertices[e]: the (v1, v2) end points of edge e, v1 < v2
+        vertex_block_masks[v]: bitset of v and its neighbours, i.e. every vertex a
+            settlement on v rules out under the distance rule
+    """
+
+    def __init__(self, board_layout):
+        """
+        Builds the graph for a board layout.
+
+        Args:
+            board_layout (dict): A dictionary keyed by (x, y) tile coordinates.
+        """
+        self.vertex_ids = {}  # Sorted triple of touching hexes: vertex ID
+        self.corner_to_vertex = {}  # (x, y, position): vertex ID
+        self.vertex_corners = []
+        self.vertex_tiles = []
+        self.edge_ids = {}  # (v1, v2) with v1 < v2: edge ID
+        self.edge_vertices = []
+
+        tiles = sorted(board_layout)
+        for x, y in tiles:
+            for position in range(6):
+                hexes = corner_tiles(x, y, position)
+                key = tuple(sorted(hexes))
+                vertex = self.vertex_ids.get(key)
+                if vertex is None:
+                    vertex = len(self.vertex_corners)
+                    self.vertex_ids[key] = vertex
+                    self.vertex_corners.append((x, y, position))
+                    self.vertex_tiles.append(tuple(tile for tile in hexes if tile in board_layout))
+                self.corner_to_vertex[(x, y, position)] = vertex
+
+        self.num_vertices = len(self.vertex_corners)
+        self.vertex_neighbours = [[] for _ in range(self.num_vertices)]
+        self.vertex_edges = [[] for _ in range(self.num_vertices)]
+        for x, y in tiles:
+            for position in range(6):
+                start = self.corner_to_vertex[(x, y, position)]
+                end = self.corner_to_vertex[(x, y, (position + 1) % 6)]
+                key = (min(start, end), max(start, end))
+                if key in self.edge_ids:
+                    continue
+                edge = len(self.edge_vertices)
+                self.edge_ids[key] = edge
+                self.edge_vertices.append(key)
+                self.vertex_neighbours[start].append(end)
+                self.vertex_neighbours[end].append(start)
+                self.vertex_edges[start].append(edge)
+                self.vertex_edges[end].append(edge)
+
+        self.num_edges = len(self.edge_vertices)
+        self.vertex_neighbours = [tuple(neighbours) for neighbours in self.vertex_neighbours]
+        self.vertex_edges = [tuple(edges) for edges in self.vertex_edges]
+        self.vertex_block_masks = []
+        for vertex, neighbours in enumerate(self.vertex_neighbours):
+            mask = 1 << vertex
+            for neighbour in neighbours:
+                mask |= 1 << neighbour
+            self.vertex_block_masks.append(mask)
+
+    def get_edge(self, start, end):
+        """
+        Returns the edge ID joining two vertices, or None if they are not adjacent.
+        """
+        return self.edge_ids.get((min(start, end), max(start, end)))
+
+    def is_valid_settlement(self, vertex, occupied):
+        """
+        Checks the distance rule: the vertex and all of its neighbours must be empty.
+
+        Args:
+            vertex (int): The vertex ID to check.
+            occupied (set): Vertex IDs that already hold a settlement or city.
+
+        Returns:
+            bool: True if a settlement may be placed on the vertex.
+        """
+        if vertex in occupied:
+            return False
+        for neighbour in self.vertex_neighbours[vertex]:
+            if neighbour in occupied:
+                return False
+        return True
+
+
+def get_board_topology(board_layout):
+    """
+    Returns the BoardTopology for a board layout, building it only the first time
+    a given set of tile coordinates is seen.
+
+    Args:
+        board_layout (dict): A dictionary keyed by (x, y) tile coordinates.
+
+    Returns:
+        BoardTopology: The shared graph for the board.
+    """
+    key = tuple(sorted(board_layout))
+    topology = _TOPOLOGY_CACHE.get(key)
+    if topology is None:
+        topology = BoardTopology(board_layout)
+        _TOPOLOGY_CACHE[key] = topology
+    return topology
+
+
+class VertexScores:
+    """
+    The board-only parts of the settlement strategies' scores, computed once per
+    board and resource_values and shared by every game played on that board.
+    """
+
+    def __init__(self, board_layout, topology, resource_values):
+        """
+        Scores every vertex of the board.
+
+        Args:
+            board_layout (dict): A dictionary representing the game board.
+            topology (BoardTopology): The vertex graph of the board.
+            resource_values (dict): A dictionary specifying the value of each resource.
+        """
+        self.common_roll_scores = []  # Pips on 6/8 (2) and 5/9 (1), +3 for 3 or more different resources
+        self.resource_value_scores = []  # resource_values of the vertex's last on-board tile
+        self.resource_masks = []  # RESOURCE_BITS of every resource the vertex touches, desert included
+        self.pip_scores = []  # Dice combinations (out of 36) that make the vertex produce, one count per tile
+        self.resource_diversity = []  # Different non-desert resources touched
+        self.value_sums = []  # resource_values summed over every on-board tile
+        for tiles in topology.vertex_tiles:
+            connected_resources = set()
+            score = 0
+            value = 0
+            mask = 0
+            pips = 0
+            value_sum = 0
+            for tile_x, tile_y in tiles:
+                tile = board_layout[(tile_x, tile_y)]
+                if tile['number'] in [6, 8]:  # High-frequency dice rolls
+                    score += 2  # Higher weight for 6 and 8
+                elif tile['number'] in [5, 9]:  # Medium-frequency dice rolls
+                    score += 1
+                if tile['resource'] != 'desert':
+                    connected_resources.add(tile['resource'])
+                    if tile['number'] != 7:
+                        pips += 6 - abs(tile['number'] - 7)
+                value = resource_values[tile['resource']]
+                value_sum += value
+                mask |= RESOURCE_BITS[tile['resource']]
+            if len(connected_resources) >= 3:  # At least 3 different resources
+                score += 3
+            self.common_roll_scores.append(score)
+            self.resource_value_scores.append(value)
+            self.resource_masks.append(mask)
+            self.pip_scores.append(pips)
+            self.resource_diversity.append(len(connected_resources))
+            self.value_sums.append(value_sum)
+
+        # Vertices best-first (ties keep vertex ID order), so a strategy only has to skip blocked ones
+        vertices = range(topology.num_vertices)
+        self.common_roll_order = sorted(vertices, key=lambda vertex: -self.common_roll_scores[vertex])
+        self.resource_value_order = sorted(vertices, key=lambda vertex: -self.resource_value_scores[vertex])
+
+
+def get_vertex_scores(board_layout, topology, resource_values):
+    """
+    Returns the VertexScores for a board and resource_values, computing them only once.
+    """
+    key = (
+        tuple(sorted((coords, tile['resource'], tile['number']) for coords, tile in board_layout.items())),
+        tuple(sorted(resource_values.items())),
+    )
+    scores = _VERTEX_SCORE_CACHE.get(key)
+    if scores is None:
+        scores = VertexScores(board_layout, topology, resource_values)
+        _VERTEX_SCORE_CACHE[key] = scores
+    return scores
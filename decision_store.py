@@ -0,0 +1,219 @@
+"""
+Columnar on-disk store of settlement decisions, and decision-tree training from it.
+
+    python finalVersionSimulationRun --games 10000 --seed 1 --decisions decisions
+    python decision_store.py train decisions --target won --max-depth 6
+
+Every settlement a CatanSimulation game builds with record_decisions=True becomes one
+row: the vertex features its strategies score (pips, resource diversity, resource_values
+sum), the player's inventory and the turn, plus the game's eventual outcome for that
+player. Rows are buffered in typed columns and written in shards, one .npy file per
+column per shard, so training can memory-map them instead of building Python lists.
+"""
+import argparse
+import os
+from array import array
+
+from board_topology import RESOURCE_TYPES
+
+# Column: array/NumPy type code, in file order
+DECISION_FIELDS = {
+    'game': 'q',
+    'seed': 'q',
+    'player': 'b',
+    'strategy': 'b',
+    'turn': 'h',
+    'vertex': 'h',
+    'pip_score': 'h',
+    'resource_diversity': 'b',
+    'value_sum': 'f',
+    **{resource: 'h' for resource in RESOURCE_TYPES},
+    'won': 'b',
+    'victory_points': 'h',
+}
+# The fields of CatanSimulation.decisions rows, in row order
+GAME_DECISION_FIELDS = ['player', 'turn', 'vertex', 'pip_score', 'resource_diversity', 'value_sum'] + RESOURCE_TYPES
+FEATURES = ['turn', 'pip_score', 'resource_diversity', 'value_sum'] + RESOURCE_TYPES
+DEFAULT_SHARD_SIZE = 1000000  # Rows per shard
+
+
+class DecisionColumns:
+    """
+    Decision rows of a batch of games, kept as one typed array per DECISION_FIELDS
+    column. Small when pickled, so workers hand them back to the main process.
+    """
+
+    def __init__(self):
+        self.columns = {field: array(code) for field, code in DECISION_FIELDS.items()}
+
+    def __len__(self):
+        return len(self.columns['game'])
+
+    def add_game(self, game_index, seed, strategies, winner, victory_points, decisions):
+        """
+        Appends the decisions of one finished game.
+
+        Args:
+            game_index (int): The index of the game within its batch.
+            seed (int): The game's seed.
+            strategies (tuple): Strategy numbers of the players, in seat order.
+            winner (int): The winning player, 0 for none.
+            victory_points (list): Final victory points per player ID (slot 0 unused).
+            decisions (list): The game's CatanSimulation.decisions rows.
+        """
+        columns = self.columns
+        for row in decisions:
+            for field, value in zip(GAME_DECISION_FIELDS, row):
+                columns[field].append(value)
+            player = row[0]
+            columns['game'].append(game_index)
+            columns['seed'].append(seed)
+            columns['strategy'].append(strategies[player - 1])
+            columns['won'].append(player == winner)
+            columns['victory_points'].append(victory_points[player])
+
+    def extend(self, other):
+        for field, column in self.columns.items():
+            column.extend(other.columns[field])
+
+    def clear(self):
+        for column in self.columns.values():
+            del column[:]
+
+
+class DecisionStore:
+    """
+    Appends decision rows to a store directory in shards of shard_size rows, each a
+    directory of one .npy file per column. Opening an existing store adds new shards
+    after the ones already there.
+    """
+
+    def __init__(self, directory, shard_size=DEFAULT_SHARD_SIZE):
+        self.directory = directory
+        self.shard_size = shard_size
+        self.buffer = DecisionColumns()
+        os.makedirs(directory, exist_ok=True)
+        self.next_shard = len(shard_paths(directory))
+
+    def write(self, decisions):
+        """
+        Buffers a batch of rows and writes out every full shard.
+
+        Args:
+            decisions (DecisionColumns): The rows to append.
+        """
+        self.buffer.extend(decisions)
+        while len(self.buffer) >= self.shard_size:
+            self.write_shard(self.shard_size)
+
+    def write_shard(self, rows):
+        import numpy as np
+        path = os.path.join(self.directory, f"{self.next_shard:05d}")
+        os.makedirs(path)
+        for field, column in self.buffer.columns.items():
+            np.save(os.path.join(path, f"{field}.npy"), np.frombuffer(column, dtype=DECISION_FIELDS[field])[:rows])
+            del column[:rows]
+        self.next_shard += 1
+
+    def close(self):
+        if len(self.buffer):
+            self.write_shard(len(self.buffer))
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+
+def shard_paths(directory):
+    """
+    Returns the shard directories of a store, in write order.
+    """
+    if not os.path.isdir(directory):
+        return []
+    return [os.path.join(directory, name) for name in sorted(os.listdir(directory)) if name.isdigit()]
+
+
+def load_shards(directory, fields=None):
+    """
+    Yields every shard of a store as {field: memory-mapped array}.
+
+    Args:
+        directory (str): The store directory.
+        fields (list): Columns to map; None maps all of DECISION_FIELDS.
+    """
+    import numpy as np
+    for path in shard_paths(directory):
+        yield {field: np.load(os.path.join(path, f"{field}.npy"), mmap_mode='r')
+               for field in (fields or DECISION_FIELDS)}
+
+
+def load_decisions(directory, fields=None):
+    """
+    Reads a store's columns into single arrays.
+
+    Returns:
+        dict: {field: array} over every shard.
+    """
+    import numpy as np
+    fields = list(fields or DECISION_FIELDS)
+    shards = list(load_shards(directory, fields))
+    return {field: np.concatenate([shard[field] for shard in shards]) if shards
+            else np.zeros(0, dtype=DECISION_FIELDS[field]) for field in fields}
+
+
+def train_decision_tree(directory, target='won', features=None, max_depth=6, test_size=0.2, seed=0):
+    """
+    Fits a DecisionTreeClassifier on a store's decisions. Only the feature and target
+    columns are read, shard by shard, into one feature matrix.
+
+    Args:
+        directory (str): The store directory.
+        target (str): The column to predict, e.g. 'won' or 'vertex'.
+        features (list): Feature columns; None uses FEATURES.
+        max_depth (int): Depth limit of the tree.
+        test_size (float): Share of the rows held out for the accuracy.
+        seed (int): Seed of the train/test split and the tree.
+
+    Returns:
+        tuple: The fitted classifier and its accuracy on the held-out rows.
+    """
+    import numpy as np
+    from sklearn.model_selection import train_test_split
+    from sklearn.tree import DecisionTreeClassifier
+
+    features = list(features or FEATURES)
+    x_parts = []
+    y_parts = []
+    for shard in load_shards(directory, features + [target]):
+        x_parts.append(np.column_stack([shard[field] for field in features]).astype(np.float32))
+        y_parts.append(np.asarray(shard[target]))
+    if not x_parts:
+        raise ValueError(f"No decisions stored in {directory}")
+    x = np.concatenate(x_parts)
+    y = np.concatenate(y_parts)
+    x_train, x_test, y_train, y_test = train_test_split(x, y, test_size=test_size, random_state=seed)
+    classifier = DecisionTreeClassifier(max_depth=max_depth, random_state=seed)
+    classifier.fit(x_train, y_train)
+    return classifier, classifier.score(x_test, y_test)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Train a decision tree on stored settlement decisions.")
+    commands = parser.add_subparsers(dest="command", required=True)
+    train_parser = commands.add_parser("train", help="fit a DecisionTreeClassifier and print it")
+    train_parser.add_argument("directory", help="decision store directory")
+    train_parser.add_argument("--target", default="won", choices=sorted(DECISION_FIELDS), help="column to predict")
+    train_parser.add_argument("--features", nargs="+", default=FEATURES, choices=sorted(DECISION_FIELDS),
+                              metavar="FIELD", help="feature columns")
+    train_parser.add_argument("--max-depth", type=int, default=6, help="depth limit of the tree")
+    train_parser.add_argument("--test-size", type=float, default=0.2, help="share of rows held out")
+    train_parser.add_argument("--seed", type=int, default=0, help="seed of the split and the tree")
+    args = parser.parse_args()
+
+    from sklearn.tree import export_text
+    tree, accuracy = train_decision_tree(args.directory, args.target, args.features, args.max_depth, args.test_size,
+                                         args.seed)
+    print(f"Rows: {tree.tree_.n_node_samples[0]} train, accuracy {accuracy:.3f} on held-out rows")
+    print(export_text(tree, feature_names=list(args.features)))
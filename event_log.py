@@ -0,0 +1,319 @@
+"""
+Append-only binary log of CatanSimulation game events, and its replay reader.
+
+    python finalVersionSimulationRun --games 100000 --seed 1 --events games.evl
+    python event_log.py summary games.evl
+    python event_log.py replay games.evl --game 42
+
+A file is a HEADER_SIZE-byte header followed by fixed-width EVENT records, one per
+game start, dice roll, production, bank trade, build and final score, in game order.
+The records map straight onto EVENT_DTYPE, so a reader memory-maps the file and scans
+columns with NumPy without loading it, or replays single games to rebuild their final
+state far faster than playing them again.
+"""
+import argparse
+import hashlib
+import os
+import struct
+
+from board_topology import RESOURCE_TYPES
+from policy_table import CITY_COST, ROAD_COST, SETTLEMENT_COST, STARTING_HAND, TRADE_RATIO
+
+MAGIC = b"CATANEV1"
+HEADER_SIZE = 16  # MAGIC, padded to one record
+EVENT = struct.Struct("<BBHIq")  # kind, player, turn, arg, value
+EVENT_FIELDS = [('kind', '<u1'), ('player', '<u1'), ('turn', '<u2'), ('arg', '<u4'), ('value', '<i8')]
+
+# Event kinds, with what their player, arg and value fields hold
+GAME = 1  # player: number of players, arg: game index, value: game seed (-1 if unseeded)
+BOARD = 2  # value: board_hash of the board
+STRATEGY = 3  # player, arg: strategy number
+ROLL = 4  # arg: dice total
+PRODUCE = 5  # player, arg: resource index, value: amount
+TRADE = 6  # player, arg: resource index given (TRADE_RATIO), value: resource index received (1)
+SETTLEMENT = 7  # player, arg: vertex ID
+CITY = 8  # player, arg: vertex ID
+ROAD = 9  # player, arg: edge ID, value: 1 if paid for, 0 for a free starting road
+SCORE = 10  # player, value: final victory points
+END = 11  # player: winner (0 for none), turn: turns played
+EVENT_NAMES = {GAME: 'game', BOARD: 'board', STRATEGY: 'strategy', ROLL: 'roll', PRODUCE: 'produce', TRADE: 'trade',
+               SETTLEMENT: 'settlement', CITY: 'city', ROAD: 'road', SCORE: 'score', END: 'end'}
+
+# What replay charges for each build, in RESOURCE_TYPES order (see CatanSimulation.build_*)
+BUILD_COSTS = {SETTLEMENT: SETTLEMENT_COST, CITY: CITY_COST, ROAD: ROAD_COST}
+
+
+def board_hash(board_layout):
+    """
+    Returns a 63-bit hash of a board's tiles and numbers, the same in every process.
+    """
+    contents = sorted((coords, tile['resource'], tile['number']) for coords, tile in board_layout.items())
+    return int.from_bytes(hashlib.sha256(repr(contents).encode()).digest()[:8], "big") >> 1
+
+
+class EventRecorder:
+    """
+    Collects the event records of a run of games in memory, numbering the games from
+    first_game. Its buffer is plain bytes, so workers hand it back to the main process.
+    """
+
+    def __init__(self, first_game=0):
+        self.buffer = bytearray()
+        self.next_game = first_game
+        self.board_hashes = {}  # id(board): (board, hash), so each board is hashed once
+
+    def record(self, kind, player=0, turn=0, arg=0, value=0):
+        self.buffer += EVENT.pack(kind, player, turn, arg, value)
+
+    def begin_game(self, seed, board_layout, strategies):
+        """
+        Starts the next game's records.
+
+        Args:
+            seed (int): The game's seed, None if unseeded.
+            board_layout (dict): The game's board.
+            strategies (list): Strategy numbers of the players, in seat order.
+        """
+        cached = self.board_hashes.get(id(board_layout))
+        if cached is None:
+            cached = self.board_hashes[id(board_layout)] = (board_layout, board_hash(board_layout))
+        self.record(GAME, len(strategies), 0, self.next_game, -1 if seed is None else seed)
+        self.record(BOARD, value=cached[1])
+        for player, strategy in enumerate(strategies, 1):
+            self.record(STRATEGY, player, 0, strategy)
+        self.next_game += 1
+
+    def end_game(self, turns, winner, victory_points):
+        """
+        Closes a game's records with the final scores.
+
+        Args:
+            turns (int): The number of turns played.
+            winner (int): The winning player, 0 for none.
+            victory_points (list): Victory points of each player, in seat order.
+        """
+        for player, points in enumerate(victory_points, 1):
+            self.record(SCORE, player, turns, 0, points)
+        self.record(END, winner, turns)
+
+    def take(self):
+        """
+        Returns the records collected so far and empties the buffer.
+        """
+        data = bytes(self.buffer)
+        self.buffer = bytearray()
+        return data
+
+
+class EventLogWriter:
+    """
+    Appends event records to a log file, writing the header if the file is new.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.file = open(path, 'ab')
+        if self.file.tell() == 0:
+            self.file.write(MAGIC.ljust(HEADER_SIZE, b"\0"))
+
+    def write(self, data):
+        self.file.write(data)
+
+    def close(self):
+        self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+
+class ReplayedGame:
+    """
+    The final state of a game rebuilt from its events.
+    """
+
+    def __init__(self, num_players, game_index, seed):
+        self.num_players = num_players
+        self.game_index = game_index
+        self.seed = seed
+        self.board_hash = None
+        self.strategies = [0] * num_players
+        self.dice = []
+        self.inventory = [list(STARTING_HAND) for _ in range(num_players + 1)]  # Per player ID, slot 0 unused
+        self.settlements = [[] for _ in range(num_players + 1)]  # Per player: vertex IDs still settlements
+        self.cities = [[] for _ in range(num_players + 1)]
+        self.roads = [[] for _ in range(num_players + 1)]  # Per player: edge IDs in build order
+        self.trades = [0] * (num_players + 1)
+        self.victory_points = [0] * (num_players + 1)
+        self.winner = 0
+        self.turns = 0
+
+
+def replay(events):
+    """
+    Rebuilds a game's final state from its records.
+
+    Args:
+        events: The game's records, a slice of EventLog.events starting at its GAME record.
+
+    Returns:
+        ReplayedGame: The rebuilt game.
+    """
+    records = events.tolist()
+    kind, num_players, _, game_index, seed = records[0]
+    if kind != GAME:
+        raise ValueError(f"A game's events start with a game record, not {EVENT_NAMES.get(kind, kind)}")
+    game = ReplayedGame(num_players, game_index, None if seed < 0 else seed)
+    inventory = game.inventory
+    for kind, player, turn, arg, value in records[1:]:
+        if kind == PRODUCE:
+            inventory[player][arg] += value
+        elif kind == ROLL:
+            game.dice.append(arg)
+        elif kind == TRADE:
+            inventory[player][arg] -= TRADE_RATIO
+            inventory[player][value] += 1
+            game.trades[player] += 1
+        elif kind == SETTLEMENT or kind == CITY or (kind == ROAD and value):
+            for index, cost in enumerate(BUILD_COSTS[kind]):
+                inventory[player][index] = max(inventory[player][index] - cost, 0)
+            if kind == SETTLEMENT:
+                game.settlements[player].append(arg)
+            elif kind == CITY:
+                game.settlements[player].remove(arg)
+                game.cities[player].append(arg)
+            else:
+                game.roads[player].append(arg)
+        elif kind == ROAD:
+            game.roads[player].append(arg)
+        elif kind == SCORE:
+            game.victory_points[player] = value
+        elif kind == END:
+            game.winner = player
+            game.turns = turn
+        elif kind == STRATEGY:
+            game.strategies[player - 1] = arg
+        elif kind == BOARD:
+            game.board_hash = value
+    return game
+
+
+class EventLog:
+    """
+    Read-only, memory-mapped view of an event log file.
+    """
+
+    def __init__(self, path):
+        import numpy as np
+        with open(path, 'rb') as file:
+            header = file.read(HEADER_SIZE)
+        if header[:len(MAGIC)] != MAGIC:
+            raise ValueError(f"{path} is not an event log")
+        self.path = path
+        dtype = np.dtype(EVENT_FIELDS)
+        size = os.path.getsize(path) - HEADER_SIZE
+        if size % dtype.itemsize:
+            raise ValueError(f"{path} ends in a partial record")
+        if size:
+            self.events = np.memmap(path, dtype=dtype, mode='r', offset=HEADER_SIZE)
+        else:
+            self.events = np.zeros(0, dtype=dtype)
+        self.game_starts = np.flatnonzero(self.events['kind'] == GAME)
+
+    def __len__(self):
+        return len(self.game_starts)
+
+    def game_events(self, game):
+        """
+        Returns the records of the game-th game in the file.
+        """
+        start = self.game_starts[game]
+        end = self.game_starts[game + 1] if game + 1 < len(self.game_starts) else len(self.events)
+        return self.events[start:end]
+
+    def replay(self, game):
+        return replay(self.game_events(game))
+
+    def games(self):
+        """
+        Yields every game in the file, replayed.
+        """
+        for game in range(len(self)):
+            yield self.replay(game)
+
+    def of_kind(self, kind):
+        """
+        Returns every record of one kind, e.g. log.of_kind(ROLL)['arg'] for all dice totals.
+        """
+        return self.events[self.events['kind'] == kind]
+
+    def dice_counts(self):
+        """
+        Returns how often each total was rolled, indexed by total.
+        """
+        import numpy as np
+        return np.bincount(self.of_kind(ROLL)['arg'], minlength=13)
+
+    def production_totals(self):
+        """
+        Returns the resources produced over every game, an array indexed by player ID
+        (row 0 unused) and resource index.
+        """
+        import numpy as np
+        produced = self.of_kind(PRODUCE)
+        num_players = int(self.events['player'][self.game_starts].max()) if len(self) else 0
+        index = produced['player'].astype(np.int64) * len(RESOURCE_TYPES) + produced['arg']
+        totals = np.bincount(index, weights=produced['value'], minlength=(num_players + 1) * len(RESOURCE_TYPES))
+        return totals.reshape(-1, len(RESOURCE_TYPES)).astype(np.int64)
+
+    def win_counts(self):
+        """
+        Returns the number of games won, indexed by player ID (index 0 counts shared leads).
+        """
+        import numpy as np
+        return np.bincount(self.of_kind(END)['player'])
+
+
+def print_summary(log):
+    games = len(log)
+    print(f"Games: {games} ({len(log.events)} events)")
+    if not games:
+        return
+    for player, wins in enumerate(log.win_counts()):
+        print(f"{'No winner' if player == 0 else f'Player {player} wins'}: {wins}")
+    dice = log.dice_counts()
+    print("\nDice Roll Percentages:")
+    for roll in range(2, 13):
+        print(f"  {roll}: {dice[roll] / max(dice.sum(), 1) * 100:.2f}%")
+    print("\nAverage Resources Produced per Game:")
+    for player, totals in enumerate(log.production_totals()[1:], 1):
+        print(f"Player {player}: " + ", ".join(f"{resource} {total / games:.2f}"
+                                               for resource, total in zip(RESOURCE_TYPES, totals)))
+
+
+def print_game(game):
+    print(f"Game {game.game_index} (seed {game.seed}, board {game.board_hash:016x}), strategies {game.strategies}")
+    print(f"Turns: {game.turns}, winner: {game.winner or 'none'}")
+    for player in range(1, game.num_players + 1):
+        print(f"Player {player}: {game.victory_points[player]} VP, settlements {game.settlements[player]}, "
+              f"cities {game.cities[player]}, {len(game.roads[player])} roads, {game.trades[player]} trades, "
+              f"inventory {dict(zip(RESOURCE_TYPES, game.inventory[player]))}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Summarise or replay a game event log.")
+    commands = parser.add_subparsers(dest="command", required=True)
+    summary_parser = commands.add_parser("summary", help="wins, dice and production over every game")
+    summary_parser.add_argument("path", help="event log file")
+    replay_parser = commands.add_parser("replay", help="rebuild and print the final state of one game")
+    replay_parser.add_argument("path", help="event log file")
+    replay_parser.add_argument("--game", type=int, default=0, help="position of the game in the file")
+    args = parser.parse_args()
+
+    event_log = EventLog(args.path)
+    if args.command == "summary":
+        print_summary(event_log)
+    else:
+        print_game(event_log.replay(args.game))
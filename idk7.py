@@ -2,7 +2,7 @@ import random
 import pygame
 import math
 from enum import Enum
-from typing import List, Dict, Tuple
+from typing import List, Dict, Tuple, Optional, Set
 
 # Initialize Pygame
 pygame.init()
@@ -10,6 +10,8 @@ pygame.init()
 # Screen dimensions
 SCREEN_WIDTH = 1000  # Increased width to add space for stats
 SCREEN_HEIGHT = 600
+SIDEBAR_WIDTH = 200
+FPS = 30  # Frame cap of the main loop
 screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
 pygame.display.set_caption("Catan Game Simulation")
 
@@ -33,6 +35,11 @@ HEX_WIDTH = 2 * HEX_RADIUS
 HEX_SPACING_X = HEX_WIDTH  # Increased horizontal spacing
 HEX_SPACING_Y = HEX_HEIGHT  # Increased vertical spacing
 
+# Corners of a hex around its lattice centre, in the order of calculate_hexagon_vertices.
+# Lattice units are half a hex width across and a quarter of a hex height down, so corners
+# shared by neighbouring hexes land on the same integer point.
+HEX_CORNER_OFFSETS = [(1, -1), (1, 1), (0, 2), (-1, 1), (-1, -1), (0, -2)]
+
 # Enum to represent resources
 class Resource(Enum):
     WOOD = "wood"
@@ -49,6 +56,69 @@ class Tile:
         self.number = number
         self.position = position
 
+# BoardModel class with the integer vertex and edge IDs of a board
+class BoardModel:
+    """
+    The graph of a board, built once from its layout: vertex IDs, edge IDs and the
+    tiles each vertex touches. Vertex IDs follow the layout scan order (row by row,
+    corners in calculate_hexagon_vertices order), so searching them in ID order visits
+    the board the same way every time. Nothing here depends on screen coordinates.
+    """
+
+    def __init__(self, tiles: Dict[int, Tile], board_layout: List[List[int]]):
+        self.tile_vertices: Dict[int, List[int]] = {}  # Tile position: its 6 vertex IDs
+        self.vertex_tiles: List[List[int]] = []  # Vertex ID: tile positions touching it
+        self.vertex_corners: List[List[Tuple[int, int]]] = []  # Vertex ID: (tile position, corner index)
+        self.vertex_edges: List[List[int]] = []  # Vertex ID: edge IDs ending there
+        self.edges: List[Tuple[int, int]] = []  # Edge ID: (vertex ID, vertex ID), lower first
+        self.edge_ids: Dict[Tuple[int, int], int] = {}
+
+        lattice_vertices = {}  # Lattice point: vertex ID
+        for row_index, row in enumerate(board_layout):
+            for col_index, tile_pos in enumerate(row):
+                if tile_pos is None or tile_pos not in tiles:
+                    continue
+                center_x = 2 * col_index + row_index % 2  # Odd rows are staggered by half a hex
+                center_y = 3 * row_index
+                corners = []
+                for corner, (dx, dy) in enumerate(HEX_CORNER_OFFSETS):
+                    point = (center_x + dx, center_y + dy)
+                    vertex = lattice_vertices.get(point)
+                    if vertex is None:
+                        vertex = lattice_vertices[point] = len(self.vertex_tiles)
+                        self.vertex_tiles.append([])
+                        self.vertex_corners.append([])
+                        self.vertex_edges.append([])
+                    self.vertex_tiles[vertex].append(tile_pos)
+                    self.vertex_corners[vertex].append((tile_pos, corner))
+                    corners.append(vertex)
+                self.tile_vertices[tile_pos] = corners
+
+                for i in range(len(corners)):
+                    edge = tuple(sorted((corners[i], corners[(i + 1) % len(corners)])))
+                    if edge not in self.edge_ids:
+                        self.edge_ids[edge] = len(self.edges)
+                        self.edges.append(edge)
+                        for vertex in edge:
+                            self.vertex_edges[vertex].append(self.edge_ids[edge])
+
+        # Dice roll: (vertex ID, resource) for every corner of every tile with that number
+        self.roll_table: Dict[int, List[Tuple[int, Resource]]] = {}
+        for tile_pos, vertices in self.tile_vertices.items():
+            tile = tiles[tile_pos]
+            if tile.resource != Resource.DESERT:
+                self.roll_table.setdefault(tile.number, []).extend((vertex, tile.resource) for vertex in vertices)
+
+    @property
+    def num_vertices(self) -> int:
+        return len(self.vertex_tiles)
+
+    def get_edge(self, start_vertex: int, end_vertex: int) -> Optional[int]:
+        """
+        Get the ID of the edge between two vertices, or None if they are not adjacent.
+        """
+        return self.edge_ids.get((min(start_vertex, end_vertex), max(start_vertex, end_vertex)))
+
 # CatanBoard class to handle the board and game mechanics
 class CatanBoard:
     def __init__(self, tiles: List[Tile], board_layout: List[List[int]]):
@@ -56,6 +126,12 @@ class CatanBoard:
         self.players = []
         self.current_turn = 0
         self.board_layout = board_layout  # Store the board layout
+        self.model = BoardModel(self.tiles, board_layout)
+
+        # Occupancy by vertex and edge ID
+        self.vertex_owner: List[Optional["Player"]] = [None] * self.model.num_vertices
+        self.vertex_level = [0] * self.model.num_vertices  # 1 for a settlement, 2 for a city
+        self.edge_owner: List[Optional["Player"]] = [None] * len(self.model.edges)
 
     def add_player(self, player: "Player"):
         self.players.append(player)
@@ -64,25 +140,16 @@ class CatanBoard:
         return random.randint(1, 6) + random.randint(1, 6)
 
     def distribute_resources(self, roll: int):
-        for tile in self.tiles.values():
-            if tile.number == roll:
-                for player in self.players:
-                    for settlement in player.settlements:
-                        if settlement in self.get_tile_vertices(tile.position):
-                            player.resources[tile.resource] += 1
-
-    def get_tile_vertices(self, tile_pos: int) -> List[Tuple[float, float]]:
+        for vertex, resource in self.model.roll_table.get(roll, ()):
+            owner = self.vertex_owner[vertex]
+            if owner is not None:
+                owner.resources[resource] += self.vertex_level[vertex]
+
+    def get_tile_vertices(self, tile_pos: int) -> List[int]:
         """
-        Get the vertices of a tile based on its position.
+        Get the vertex IDs of a tile based on its position.
         """
-        for row_index, row in enumerate(self.board_layout):
-            if tile_pos in row:
-                col_index = row.index(tile_pos)
-                stagger_offset = (row_index % 2) * (HEX_SPACING_X / 2)
-                center_x = col_index * HEX_SPACING_X + stagger_offset
-                center_y = row_index * HEX_SPACING_Y
-                return calculate_hexagon_vertices(center_x, center_y)
-        return []
+        return self.model.tile_vertices.get(tile_pos, [])
 
     def next_turn(self):
         self.current_turn = (self.current_turn + 1) % len(self.players)
@@ -102,30 +169,37 @@ class Player:
             Resource.WHEAT: 3,
             Resource.ORE: 3,
         }
-        self.settlements = []
-        self.roads = []
-        self.cities = []  # New attribute for cities
+        self.settlements: List[int] = []  # Vertex IDs
+        self.roads: List[int] = []  # Edge IDs
+        self.cities: List[int] = []  # New attribute for cities
+        self.network: Set[int] = set()  # Vertex IDs reached by the player's buildings and roads
         self.victory_points = 0
         self.game_board = game_board
 
-    def build_settlement(self, position: Tuple[float, float]):
+    def build_settlement(self, position: int):
         self.settlements.append(position)
+        self.network.add(position)
+        self.game_board.vertex_owner[position] = self
+        self.game_board.vertex_level[position] = 1
         self.resources[Resource.WOOD] -= 1
         self.resources[Resource.BRICK] -= 1
         self.resources[Resource.SHEEP] -= 1
         self.resources[Resource.WHEAT] -= 1
         self.calculate_victory_points()
 
-    def build_road(self, start_pos: Tuple[float, float], end_pos: Tuple[float, float]):
-        if (start_pos, end_pos) not in self.roads and (end_pos, start_pos) not in self.roads:
-            self.roads.append((start_pos, end_pos))
+    def build_road(self, edge: int):
+        if edge not in self.roads:
+            self.roads.append(edge)
+            self.network.update(self.game_board.model.edges[edge])
+            self.game_board.edge_owner[edge] = self
             self.resources[Resource.WOOD] -= 1
             self.resources[Resource.BRICK] -= 1
 
-    def build_city(self, position: Tuple[float, float]):
+    def build_city(self, position: int):
         if position in self.settlements:
             self.settlements.remove(position)
             self.cities.append(position)
+            self.game_board.vertex_level[position] = 2
             self.resources[Resource.WHEAT] -= 2
             self.resources[Resource.ORE] -= 3
             self.calculate_victory_points()
@@ -134,30 +208,27 @@ class Player:
         self.victory_points = len(self.settlements) + 2 * len(self.cities)  # 1 point per settlement, 2 per city
 
 # Function to handle road placement
-def handle_road_placement(player, start_pos, end_pos, board_layout):
-    # Ensure the tiles are adjacent
-    start_x, start_y = get_tile_center(start_pos, board_layout)
-    end_x, end_y = get_tile_center(end_pos, board_layout)
-    distance = math.sqrt((start_x - end_x) ** 2 + (start_y - end_y) ** 2)
+def handle_road_placement(player, start_vertex, end_vertex):
+    # Ensure the vertices are adjacent
+    edge = player.game_board.model.get_edge(start_vertex, end_vertex)
 
-    if distance <= HEX_SPACING_X:  # Tiles are adjacent
+    if edge is not None:
         # Ensure the road connects to an existing settlement or road
-        if start_pos in player.settlements or end_pos in player.settlements or \
-           any(start_pos in road or end_pos in road for road in player.roads):
-            player.build_road(start_pos, end_pos)
-            print(f"{player.name} built a road between {start_pos} and {end_pos}")
+        if start_vertex in player.network or end_vertex in player.network:
+            player.build_road(edge)
+            print(f"{player.name} built a road between {start_vertex} and {end_vertex}")
         else:
             print(f"{player.name} cannot build a road here. It must connect to a settlement or road.")
     else:
-        print("The selected tiles are not adjacent.")
+        print("The selected vertices are not adjacent.")
 
 # Function to handle starting settlement placement
-def handle_starting_settlement(player, position, board_layout):
+def handle_starting_settlement(player, position):
     """
     Handles the placement of a starting settlement.
     """
-    # Ensure the position is valid and not already occupied
-    if position in player.settlements or any(position in p.settlements for p in board.players):
+    # Ensure the position is not already occupied
+    if player.game_board.vertex_owner[position] is not None:
         print(f"Position {position} is already occupied by a settlement.")
         return False
 
@@ -167,25 +238,22 @@ def handle_starting_settlement(player, position, board_layout):
     return True
 
 # Function to handle starting road placement
-def handle_starting_road(player, start_vertex, end_vertex, board_layout):
+def handle_starting_road(player, start_vertex, end_vertex):
     """
     Handles the placement of a starting road between two vertices.
     """
-    # Ensure the vertices are valid and adjacent
-    start_x, start_y = start_vertex
-    end_x, end_y = end_vertex
-    distance = math.sqrt((start_x - end_x) ** 2 + (start_y - end_y) ** 2)
+    # Ensure the vertices are adjacent
+    edge = player.game_board.model.get_edge(start_vertex, end_vertex)
 
-    if distance <= HEX_SPACING_X:  # Vertices are adjacent
+    if edge is not None:
         # Ensure the road connects to the settlement just placed or an existing road
-        if start_vertex in player.settlements or end_vertex in player.settlements or \
-           any(start_vertex in road or end_vertex in road for road in player.roads):
+        if start_vertex in player.network or end_vertex in player.network:
             # Check if the road already exists
-            if (start_vertex, end_vertex) in player.roads or (end_vertex, start_vertex) in player.roads:
+            if player.game_board.edge_owner[edge] is not None:
                 print(f"A road already exists between {start_vertex} and {end_vertex}.")
                 return False
 
-            player.build_road(start_vertex, end_vertex)
+            player.build_road(edge)
             print(f"{player.name} placed a starting road between {start_vertex} and {end_vertex}.")
             return True
         else:
@@ -261,35 +329,106 @@ def draw_hexagon(surface, center_x, center_y, color, outline_color=BLACK):
     pygame.draw.polygon(surface, color, vertices)
     pygame.draw.polygon(surface, outline_color, vertices, 2)
 
-# Draw the board
-def draw_board(surface, board_layout, tiles):
-    board_width = len(board_layout[2]) * HEX_SPACING_X
-    board_height = len(board_layout) * HEX_SPACING_Y
-    offset_x = (SCREEN_WIDTH - 200 - board_width) // 2  # Adjusted for stats sidebar
-    offset_y = (SCREEN_HEIGHT - board_height) // 2
-
-    for row_index, row in enumerate(board_layout):
-        for col_index, tile_pos in enumerate(row):
-            if tile_pos is not None:
-                stagger_offset = (row_index % 2) * (HEX_SPACING_X / 2)
-                center_x = offset_x + col_index * HEX_SPACING_X + stagger_offset
-                center_y = offset_y + row_index * HEX_SPACING_Y
-                if 1 <= tile_pos <= len(tiles):
-                    tile = tiles[tile_pos - 1]
-                    draw_hexagon(surface, center_x, center_y, COLORS[tile.resource.value])
-                    font = pygame.font.Font(None, 24)
-                    text = font.render(f"{tile.resource.name.capitalize()}", True, BLACK)
-                    surface.blit(text, (center_x - text.get_width() // 2, center_y - 20))
-                    number_text = font.render(f"{tile.number}", True, BLACK)
-                    surface.blit(number_text, (center_x - number_text.get_width() // 2, center_y + 10))
+# BoardRenderer class holding the screen geometry of the board
+class BoardRenderer:
+    """
+    Pixel positions of the tiles and vertices, and the board drawn once into a
+    background surface. Pieces are drawn onto the screen as they are built, and every
+    draw returns the rectangles it touched so only those are pushed to the display.
+    """
+
+    def __init__(self, board: CatanBoard):
+        board_layout = board.board_layout
+        board_width = len(board_layout[2]) * HEX_SPACING_X
+        board_height = len(board_layout) * HEX_SPACING_Y
+        offset_x = (SCREEN_WIDTH - SIDEBAR_WIDTH - board_width) // 2  # Adjusted for stats sidebar
+        offset_y = (SCREEN_HEIGHT - board_height) // 2
+
+        self.tile_centers: Dict[int, Tuple[float, float]] = {}
+        for row_index, row in enumerate(board_layout):
+            for col_index, tile_pos in enumerate(row):
+                if tile_pos is not None and tile_pos in board.tiles:
+                    stagger_offset = (row_index % 2) * (HEX_SPACING_X / 2)
+                    self.tile_centers[tile_pos] = (offset_x + col_index * HEX_SPACING_X + stagger_offset,
+                                                   offset_y + row_index * HEX_SPACING_Y)
+
+        # Each vertex is drawn between the matching corners of the hexes it touches
+        self.vertex_points: List[Tuple[int, int]] = []
+        for corners in board.model.vertex_corners:
+            points = [calculate_hexagon_vertices(*self.tile_centers[tile_pos])[corner] for tile_pos, corner in corners]
+            self.vertex_points.append((int(sum(x for x, _ in points) / len(points)),
+                                       int(sum(y for _, y in points) / len(points))))
+
+        self.font = pygame.font.Font(None, 24)
+        self.button_font = pygame.font.Font(None, 30)
+        self.dice_font = pygame.font.Font(None, 36)
+        self.background = pygame.Surface((SCREEN_WIDTH - SIDEBAR_WIDTH, SCREEN_HEIGHT))
+        self.background.fill(WHITE)
+        for tile_pos, (center_x, center_y) in self.tile_centers.items():
+            tile = board.tiles[tile_pos]
+            draw_hexagon(self.background, center_x, center_y, COLORS[tile.resource.value])
+            text = self.font.render(f"{tile.resource.name.capitalize()}", True, BLACK)
+            self.background.blit(text, (center_x - text.get_width() // 2, center_y - 20))
+            number_text = self.font.render(f"{tile.number}", True, BLACK)
+            self.background.blit(number_text, (center_x - number_text.get_width() // 2, center_y + 10))
+
+        self.model = board.model
+        self.drawn = set()  # ("road" | "settlement" | "city", ID) of the pieces on screen
+
+    def draw_all(self, surface, players, last_dice_roll=None) -> List[pygame.Rect]:
+        """
+        Draw the whole frame: board, every piece and the sidebar.
+        """
+        surface.blit(self.background, (0, 0))
+        self.drawn.clear()
+        self.draw_pieces(surface, players)
+        self.draw_sidebar(surface, players, last_dice_roll)
+        return [surface.get_rect()]
+
+    def draw_pieces(self, surface, players) -> List[pygame.Rect]:
+        """
+        Draw the settlements, roads, and cities built since the last draw.
+        """
+        dirty = []
+        for player in players:
+            for edge in player.roads:
+                if ("road", edge) not in self.drawn:
+                    self.drawn.add(("road", edge))
+                    start, end = self.model.edges[edge]
+                    dirty.append(pygame.draw.line(surface, player.color, self.vertex_points[start],
+                                                  self.vertex_points[end], 5))  # Road as a thick line
+            for vertex in player.settlements:
+                if ("settlement", vertex) not in self.drawn:
+                    self.drawn.add(("settlement", vertex))
+                    dirty.append(pygame.draw.circle(surface, BLACK, self.vertex_points[vertex], 10))  # Small circle
+                    pygame.draw.circle(surface, player.color, self.vertex_points[vertex], 8)  # Player color inside
+            for vertex in player.cities:
+                if ("city", vertex) not in self.drawn:
+                    self.drawn.add(("city", vertex))
+                    dirty.append(pygame.draw.circle(surface, BLACK, self.vertex_points[vertex], 15))  # Larger circle
+                    pygame.draw.circle(surface, player.color, self.vertex_points[vertex], 13)  # Player color inside
+        return dirty
+
+    def draw_sidebar(self, surface, players, last_dice_roll=None) -> pygame.Rect:
+        """
+        Draw the stats sidebar with the "Next Turn" button and the last dice roll.
+        """
+        draw_stats(surface, players, self.font)
+        draw_next_turn_button(surface, self.button_font)
+
+        # Display the last dice roll result
+        if last_dice_roll is not None:
+            dice_text = self.dice_font.render(f"Dice Roll: {last_dice_roll}", True, BLACK)
+            surface.blit(dice_text, (SCREEN_WIDTH - 180, SCREEN_HEIGHT - 200))
+        return pygame.Rect(SCREEN_WIDTH - SIDEBAR_WIDTH, 0, SIDEBAR_WIDTH, SCREEN_HEIGHT)
 
 # Draw player stats
-def draw_stats(surface, players):
-    font = pygame.font.Font(None, 24)
-    x_offset = SCREEN_WIDTH - 200  # Sidebar position
+def draw_stats(surface, players, font=None):
+    font = font or pygame.font.Font(None, 24)
+    x_offset = SCREEN_WIDTH - SIDEBAR_WIDTH  # Sidebar position
     y_offset = 20
 
-    pygame.draw.rect(surface, GRAY, (x_offset, 0, 200, SCREEN_HEIGHT))  # Sidebar background
+    pygame.draw.rect(surface, GRAY, (x_offset, 0, SIDEBAR_WIDTH, SCREEN_HEIGHT))  # Sidebar background
 
     for player in players:
         text = font.render(f"{player.name}", True, BLACK)
@@ -305,66 +444,25 @@ def draw_stats(surface, players):
         surface.blit(vp_text, (x_offset + 10, y_offset))
         y_offset += 40
 
-# Adjusted get_tile_center function for staggered grid
-def get_tile_center(pos, board_layout):
-    # Calculate the offset to center the board
-    board_width = len(board_layout[2]) * HEX_SPACING_X  # Center based on the widest row
-    board_height = len(board_layout) * HEX_SPACING_Y
-    offset_x = (SCREEN_WIDTH - board_width) // 2
-    offset_y = (SCREEN_HEIGHT - board_height) // 2
-
-    for row_index, row in enumerate(board_layout):
-        if pos in row:
-            col_index = row.index(pos)
-            # Adjust the x-coordinate for staggered rows
-            stagger_offset = (row_index % 2) * (HEX_SPACING_X / 2)
-            center_x = offset_x + col_index * HEX_SPACING_X + stagger_offset
-            center_y = offset_y + row_index * HEX_SPACING_Y
-            return center_x, center_y
-    return None, None
-
-# Draw settlements, roads, and cities on vertices and edges
-def draw_game_elements(surface, players, board_layout):
-    """
-    Draw settlements, roads, and cities on the hexagon vertices and edges.
-    """
-    for player in players:
-        # Draw settlements
-        for settlement_pos in player.settlements:
-            x, y = settlement_pos
-            pygame.draw.circle(surface, BLACK, (int(x), int(y)), 10)  # Settlement as a small circle
-            pygame.draw.circle(surface, player.color, (int(x), int(y)), 8)  # Player color inside
-
-        # Draw roads
-        for road in player.roads:
-            start_pos, end_pos = road
-            pygame.draw.line(surface, player.color, start_pos, end_pos, 5)  # Road as a thick line
-
-        # Draw cities
-        for city_pos in player.cities:
-            x, y = city_pos
-            pygame.draw.circle(surface, BLACK, (int(x), int(y)), 15)  # City as a larger circle
-            pygame.draw.circle(surface, player.color, (int(x), int(y)), 13)  # Player color inside
-
 # Function to draw the "Roll Dice" button
-def draw_roll_dice_button(surface):
+def draw_roll_dice_button(surface, font=None):
     button_rect = pygame.Rect(SCREEN_WIDTH - 180, SCREEN_HEIGHT - 80, 160, 50)  # Button dimensions
     pygame.draw.rect(surface, GRAY, button_rect)  # Button background
     pygame.draw.rect(surface, BLACK, button_rect, 2)  # Button border
 
-    font = pygame.font.Font(None, 30)
+    font = font or pygame.font.Font(None, 30)
     text = font.render("Roll Dice", True, BLACK)
     surface.blit(text, (button_rect.x + (button_rect.width - text.get_width()) // 2,
                         button_rect.y + (button_rect.height - text.get_height()) // 2))
     return button_rect
 
 # Function to draw the "Next Turn" button
-def draw_next_turn_button(surface):
+def draw_next_turn_button(surface, font=None):
     button_rect = pygame.Rect(SCREEN_WIDTH - 180, SCREEN_HEIGHT - 140, 160, 50)  # Button dimensions
     pygame.draw.rect(surface, GRAY, button_rect)  # Button background
     pygame.draw.rect(surface, BLACK, button_rect, 2)  # Button border
 
-    font = pygame.font.Font(None, 30)
+    font = font or pygame.font.Font(None, 30)
     text = font.render("Next Turn", True, BLACK)
     surface.blit(text, (button_rect.x + (button_rect.width - text.get_width()) // 2,
                         button_rect.y + (button_rect.height - text.get_height()) // 2))
@@ -372,7 +470,7 @@ def draw_next_turn_button(surface):
 
 def player_can_build_settlement(player, position):
     """
-    Check if the player can build a settlement at the given position.
+    Check if the player can build a settlement at the given vertex.
     """
     # Required resources for a settlement
     required_resources = {Resource.WOOD: 1, Resource.BRICK: 1, Resource.SHEEP: 1, Resource.WHEAT: 1}
@@ -380,14 +478,13 @@ def player_can_build_settlement(player, position):
     # Check if the player has enough resources
     if all(player.resources[resource] >= amount for resource, amount in required_resources.items()):
         # Check if the position is valid (not already occupied)
-        if position not in player.settlements and position not in player.cities and \
-           all(position not in p.settlements for p in player.game_board.players):
+        if player.game_board.vertex_owner[position] is None:
             return True
     return False
 
-def player_can_build_road(player, start_pos, end_pos):
+def player_can_build_road(player, edge):
     """
-    Check if the player can build a road between the given positions.
+    Check if the player can build a road on the given edge.
     """
     # Required resources for a road
     required_resources = {Resource.WOOD: 1, Resource.BRICK: 1}
@@ -395,10 +492,10 @@ def player_can_build_road(player, start_pos, end_pos):
     # Check if the player has enough resources
     if all(player.resources[resource] >= amount for resource, amount in required_resources.items()):
         # Check if the road is valid (not already occupied)
-        if (start_pos, end_pos) not in player.roads and (end_pos, start_pos) not in player.roads:
+        if player.game_board.edge_owner[edge] is None:
             # Ensure the road connects to the player's own settlements or roads
-            if start_pos in player.settlements or end_pos in player.settlements or \
-               any(start_pos in road or end_pos in road for road in player.roads):
+            start_vertex, end_vertex = player.game_board.model.edges[edge]
+            if start_vertex in player.network or end_vertex in player.network:
                 return True
     return False
 
@@ -416,56 +513,30 @@ def player_can_build_city(player, position):
             return True
     return False
 
-def attempt_to_build_settlement(player, board_layout):
+def attempt_to_build_settlement(player):
     """
     Attempt to build a settlement for the AI player.
     """
-    for row_index, row in enumerate(board_layout):
-        if row is None:
-            continue
-        for col_index, tile_pos in enumerate(row):
-            if tile_pos is not None:  # Only consider valid tiles
-                # Calculate hexagon center
-                stagger_offset = (row_index % 2) * (HEX_SPACING_X / 2)
-                center_x = (col_index * HEX_SPACING_X) + stagger_offset + (SCREEN_WIDTH - len(board_layout[2]) * HEX_SPACING_X) // 2
-                center_y = (row_index * HEX_SPACING_Y) + (SCREEN_HEIGHT - len(board_layout) * HEX_SPACING_Y) // 2
-
-                # Get vertices of the hexagon
-                vertices = calculate_hexagon_vertices(center_x, center_y)
-
-                # Check for a valid settlement position
-                for vertex in vertices:
-                    if player_can_build_settlement(player, vertex):
-                        player.build_settlement(vertex)
-                        print(f"{player.name} built a settlement at {vertex}")
-                        return True  # End turn after building a settlement
+    # Check for a valid settlement position, in vertex ID order
+    for vertex in range(player.game_board.model.num_vertices):
+        if player_can_build_settlement(player, vertex):
+            player.build_settlement(vertex)
+            print(f"{player.name} built a settlement at {vertex}")
+            return True  # End turn after building a settlement
     return False
 
-def attempt_to_build_road(player, board_layout):
+def attempt_to_build_road(player):
     """
     Attempt to build a road for the AI player.
     """
-    for row_index, row in enumerate(board_layout):
-        if row is None:
-            continue
-        for col_index, tile_pos in enumerate(row):
-            if tile_pos is not None:  # Only consider valid tiles
-                # Calculate hexagon center
-                stagger_offset = (row_index % 2) * (HEX_SPACING_X / 2)
-                center_x = (col_index * HEX_SPACING_X) + stagger_offset + (SCREEN_WIDTH - len(board_layout[2]) * HEX_SPACING_X) // 2
-                center_y = (row_index * HEX_SPACING_Y) + (SCREEN_HEIGHT - len(board_layout) * HEX_SPACING_Y) // 2
-
-                # Get vertices and edges of the hexagon
-                vertices = calculate_hexagon_vertices(center_x, center_y)
-                edges = [(vertices[i], vertices[(i + 1) % len(vertices)]) for i in range(len(vertices))]
-
-                # Check for a valid road position
-                for start_vertex, end_vertex in edges:
-                    if (start_vertex in player.settlements or end_vertex in player.settlements) and \
-                       player_can_build_road(player, start_vertex, end_vertex):
-                        player.build_road(start_vertex, end_vertex)
-                        print(f"{player.name} built a road between {start_vertex} and {end_vertex}")
-                        return True  # End turn after building a road
+    model = player.game_board.model
+    # Check for a valid road position next to one of the player's settlements
+    for settlement in player.settlements:
+        for edge in model.vertex_edges[settlement]:
+            if player_can_build_road(player, edge):
+                player.build_road(edge)
+                print(f"{player.name} built a road between {model.edges[edge][0]} and {model.edges[edge][1]}")
+                return True  # End turn after building a road
     return False
 
 def attempt_to_build_city(player):
@@ -479,123 +550,100 @@ def attempt_to_build_city(player):
             return True  # End turn after building a city
     return False
 
-def ai_take_turn(player, board_layout):
+def place_starting_settlement(player):
+    """
+    Place an AI player's starting settlement on the first free vertex.
+
+    Returns:
+        The vertex ID of the settlement, or None if the board is full.
+    """
+    for vertex in range(player.game_board.model.num_vertices):
+        if player.game_board.vertex_owner[vertex] is None and handle_starting_settlement(player, vertex):
+            return vertex
+    return None
+
+def place_starting_road(player, settlement):
+    """
+    Place an AI player's starting road on the first free edge out of its settlement.
+    """
+    model = player.game_board.model
+    for edge in model.vertex_edges[settlement]:
+        start_vertex, end_vertex = model.edges[edge]
+        if player.game_board.edge_owner[edge] is None and handle_starting_road(player, start_vertex, end_vertex):
+            return True
+    return False
+
+def ai_take_turn(player):
     """
     AI logic for taking a turn.
     """
     print(f"{player.name}'s turn (AI)")
 
     # Roll the dice
-    dice_roll = roll_dice_and_distribute(board)
+    dice_roll = roll_dice_and_distribute(player.game_board)
     print(f"{player.name} rolled a {dice_roll}")
 
     # Attempt to build a settlement
-    if not attempt_to_build_settlement(player, board_layout):
+    if not attempt_to_build_settlement(player):
         # Attempt to build a road
-        if not attempt_to_build_road(player, board_layout):
+        if not attempt_to_build_road(player):
             # Attempt to build a city
             if not attempt_to_build_city(player):
                 print(f"{player.name} could not perform any actions this turn.")
+    return dice_roll
 
 # Updated main game loop with vertex-based settlements and edge-based roads
 def main():
     running = True
     starting_phase = True  # Flag for the starting placement phase
-    selected_vertex = None  # To track the first vertex clicked for road placement
+    selected_vertex = None  # To track the starting settlement the road goes out of
     current_player_index = 0  # Track which player's turn it is
     last_dice_roll = None  # Store the last dice roll result
-    wait_for_next_turn = True  # Flag to wait for "Next Turn" button click
+    clock = pygame.time.Clock()
 
-    while running:
-        screen.fill(WHITE)
-        draw_board(screen, board_layout, tiles)
-        draw_stats(screen, board.players)
-        draw_game_elements(screen, board.players, board_layout)  # Draw settlements, roads, and cities
+    renderer = BoardRenderer(board)
+    next_turn_button = draw_next_turn_button(screen)
+    pygame.display.update(renderer.draw_all(screen, board.players, last_dice_roll))
 
-        # Draw the "Next Turn" button
-        next_turn_button = draw_next_turn_button(screen)
-
-        # Display the last dice roll result
-        if last_dice_roll is not None:
-            font = pygame.font.Font(None, 36)
-            dice_text = font.render(f"Dice Roll: {last_dice_roll}", True, BLACK)
-            screen.blit(dice_text, (SCREEN_WIDTH - 180, SCREEN_HEIGHT - 200))
+    while running:
+        # Nothing changes on screen between events, so sleep until the next one arrives
+        events = [pygame.event.wait()] + pygame.event.get()
+        next_turn = False
+        dirty = []
 
-        for event in pygame.event.get():
+        for event in events:
             if event.type == pygame.QUIT:
                 running = False
             elif event.type == pygame.MOUSEBUTTONDOWN:
-                mouse_x, mouse_y = pygame.mouse.get_pos()
-
                 # Check if the "Next Turn" button was clicked
-                if next_turn_button.collidepoint(mouse_x, mouse_y):
-                    wait_for_next_turn = False  # Allow the next turn to proceed
+                if next_turn_button.collidepoint(event.pos):
+                    next_turn = True  # Allow the next turn to proceed
+            elif event.type in (pygame.VIDEOEXPOSE, pygame.WINDOWEXPOSED):
+                dirty += renderer.draw_all(screen, board.players, last_dice_roll)
 
         # Handle AI turns
-        if not wait_for_next_turn:
+        if next_turn and running:
             player = board.players[current_player_index]
             if starting_phase:
                 # Starting phase logic for AI
                 if selected_vertex is None:
                     # Place starting settlement
-                    for row_index, row in enumerate(board_layout):
-                        if row is None:
-                            continue
-                        for col_index, tile_pos in enumerate(row):
-                            if tile_pos is not None:
-                                # Calculate hexagon center
-                                stagger_offset = (row_index % 2) * (HEX_SPACING_X / 2)
-                                center_x = (col_index * HEX_SPACING_X) + stagger_offset + (SCREEN_WIDTH - len(board_layout[2]) * HEX_SPACING_X) // 2
-                                center_y = (row_index * HEX_SPACING_Y) + (SCREEN_HEIGHT - len(board_layout) * HEX_SPACING_Y) // 2
-
-                                # Get vertices of the hexagon
-                                vertices = calculate_hexagon_vertices(center_x, center_y)
-
-                                # Check for a valid settlement position
-                                for vertex in vertices:
-                                    if handle_starting_settlement(player, vertex, board_layout):
-                                        selected_vertex = vertex  # Save the settlement position
-                                        print(f"{player.name} placed a starting settlement at {vertex}")
-                                        break
-                            if selected_vertex is not None:
-                                break
-                        if selected_vertex is not None:
-                            break
+                    selected_vertex = place_starting_settlement(player)
                 else:
                     # Place starting road
-                    for row_index, row in enumerate(board_layout):
-                        if row is None:
-                            continue
-                        for col_index, tile_pos in enumerate(row):
-                            if tile_pos is not None:
-                                # Calculate hexagon center
-                                stagger_offset = (row_index % 2) * (HEX_SPACING_X / 2)
-                                center_x = (col_index * HEX_SPACING_X) + stagger_offset + (SCREEN_WIDTH - len(board_layout[2]) * HEX_SPACING_X) // 2
-                                center_y = (row_index * HEX_SPACING_Y) + (SCREEN_HEIGHT - len(board_layout) * HEX_SPACING_Y) // 2
-
-                                # Get vertices of the hexagon
-                                vertices = calculate_hexagon_vertices(center_x, center_y)
-
-                                # Check for a valid road position
-                                for vertex in vertices:
-                                    if handle_starting_road(player, selected_vertex, vertex, board_layout):
-                                        selected_vertex = None  # Reset selection
-                                        current_player_index = (current_player_index + 1) % len(board.players)
-                                        if current_player_index == 0:
-                                            starting_phase = False  # End starting phase after all players finish
-                                        print(f"{player.name} placed a starting road.")
-                                        break
-                            if selected_vertex is None:
-                                break
-                        if selected_vertex is None:
-                            break
+                    if place_starting_road(player, selected_vertex):
+                        print(f"{player.name} placed a starting road.")
+                    selected_vertex = None  # Reset selection
+                    current_player_index = (current_player_index + 1) % len(board.players)
+                    if current_player_index == 0:
+                        starting_phase = False  # End starting phase after all players finish
             else:
                 # Main gameplay logic for AI
-                ai_take_turn(player, board_layout)
+                last_dice_roll = ai_take_turn(player)
                 current_player_index = (current_player_index + 1) % len(board.players)
 
-            # Reset the flag to wait for the next turn
-            wait_for_next_turn = True
+            dirty += renderer.draw_pieces(screen, board.players)
+            dirty.append(renderer.draw_sidebar(screen, board.players, last_dice_roll))
 
         # Check for victory condition
         for player in board.players:
@@ -603,9 +651,11 @@ def main():
                 print(f"{player.name} wins the game!")
                 running = False
 
-        pygame.display.flip()
+        if dirty:
+            pygame.display.update(dirty)
+        clock.tick(FPS)
 
     pygame.quit()
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
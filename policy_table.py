@@ -0,0 +1,199 @@
+"""
+Memoized trade and build policy of CatanSimulation players.
+
+Each turn a player makes at most one 4:1 bank trade (trade_with_bank), then goes for a
+settlement, a city or a road, whichever it can afford first. Both choices follow
+from a small state: the five resource counts, whether the player has a settlement
+to upgrade and how many cities it has. Counts only matter up to CLIP, the largest
+threshold any rule compares against after a trade. The state is packed into one
+integer key, and the table memoizes one decision per key.
+
+Tables hold plain dicts of small tuples and are cached per rule set, so every game
+of a process shares one table and forked worker processes inherit it.
+"""
+from board_topology import RESOURCE_TYPES
+
+# The rules of CatanSimulation, in RESOURCE_TYPES order; CatanSimulation and event_log read them from here
+STARTING_HAND = (2, 2, 2, 2, 0)
+SETTLEMENT_COST = (1, 1, 1, 1, 0)
+CITY_COST = (0, 0, 0, 2, 3)
+ROAD_COST = (1, 1, 0, 0, 0)
+TRADE_TARGET = (1, 1, 1, 1, 3)  # What trade_with_bank trades towards: a settlement, plus ore for a city
+TRADE_RATIO = 4
+
+# Bits of a decision's builds: what the player can afford after its trade
+BUILD_SETTLEMENT = 1
+BUILD_CITY = 2
+BUILD_ROAD = 4
+
+NO_TRADE = -1
+
+_POLICY_CACHE = {}  # Rules: PolicyTable
+
+
+class PolicyTable:
+    """
+    Decisions keyed on packed player states. A decision is a (give, receive, builds)
+    tuple: the resource index traded away (TRADE_RATIO of it) and the one received,
+    both NO_TRADE without a trade, and the BUILD_* bits of what can be afforded after it.
+    """
+
+    def __init__(self, max_cities, settlement_cost=SETTLEMENT_COST, city_cost=CITY_COST, road_cost=ROAD_COST,
+                 trade_target=TRADE_TARGET, trade_ratio=TRADE_RATIO):
+        """
+        Args:
+            max_cities (int): The maximum number of cities per player.
+            settlement_cost (tuple): Resources a settlement costs, in RESOURCE_TYPES order.
+            city_cost (tuple): Resources a city costs.
+            road_cost (tuple): Resources a road costs.
+            trade_target (tuple): The counts a player trades towards.
+            trade_ratio (int): Resources given per resource received in a bank trade.
+        """
+        self.max_cities = max_cities
+        self.settlement_cost = settlement_cost
+        self.city_cost = city_cost
+        self.road_cost = road_cost
+        self.trade_target = trade_target
+        self.trade_ratio = trade_ratio
+        # Counts at or above CLIP decide the same: before a trade up to the ratio, after it up to every cost
+        self.clip = trade_ratio + max(settlement_cost + city_cost + road_cost + trade_target)
+        self.bits = self.clip.bit_length()
+        self.count_mask = (1 << self.bits) - 1
+        self.entries = {}  # Packed state: decision
+
+    def __len__(self):
+        return len(self.entries)
+
+    @property
+    def num_states(self):
+        """
+        The number of distinct packed states.
+        """
+        return (self.clip + 1) ** len(RESOURCE_TYPES) * 2 * (self.max_cities + 1)
+
+    def pack(self, inventory, settlements, cities):
+        """
+        Returns the packed state of a player.
+
+        Args:
+            inventory (list): The player's resource counts in RESOURCE_TYPES order.
+            settlements (int): The player's number of settlements (not cities).
+            cities (int): The player's number of cities.
+        """
+        clip = self.clip
+        bits = self.bits
+        key = 0
+        for count in reversed(inventory):
+            key = (key << bits) | (count if count < clip else clip)
+        return key | (settlements > 0) << 5 * bits | min(cities, self.max_cities) << 5 * bits + 1
+
+    def unpack(self, key):
+        """
+        Returns the clipped (inventory, settlements, cities) of a packed state.
+        """
+        bits = self.bits
+        inventory = [(key >> index * bits) & self.count_mask for index in range(len(RESOURCE_TYPES))]
+        return inventory, (key >> 5 * bits) & 1, key >> 5 * bits + 1
+
+    def lookup(self, inventory, settlements, cities):
+        """
+        Returns the decision for a player's state, deciding it the first time the state is seen.
+        """
+        key = self.pack(inventory, settlements, cities)
+        decision = self.entries.get(key)
+        if decision is None:
+            decision = self.entries[key] = self.decide(key)
+        return decision
+
+    def affordable(self, inventory, settlements, cities):
+        """
+        Returns the BUILD_* bits of what a state can afford.
+        """
+        builds = 0
+        if all(count >= cost for count, cost in zip(inventory, self.settlement_cost)):
+            builds |= BUILD_SETTLEMENT
+        if (all(count >= cost for count, cost in zip(inventory, self.city_cost)) and settlements > 0
+                and cities < self.max_cities):
+            builds |= BUILD_CITY
+        if all(count >= cost for count, cost in zip(inventory, self.road_cost)):
+            builds |= BUILD_ROAD
+        return builds
+
+    def decide(self, key):
+        """
+        Decides a packed state with the rules of CatanSimulation.trade_with_bank_by_rules:
+        a player who can build neither a settlement nor a city trades the first resource
+        it holds TRADE_RATIO of (and is not short of) for the first resource it is short of.
+        """
+        inventory, settlements, cities = self.unpack(key)
+        give = receive = NO_TRADE
+        if not self.affordable(inventory, settlements, cities) & (BUILD_SETTLEMENT | BUILD_CITY):
+            missing = [index for index, target in enumerate(self.trade_target) if inventory[index] < target]
+            if missing:
+                for index, count in enumerate(inventory):
+                    if count >= self.trade_ratio and index not in missing:
+                        give, receive = index, missing[0]
+                        inventory[give] -= self.trade_ratio
+                        inventory[receive] += 1
+                        break
+        return give, receive, self.affordable(inventory, settlements, cities)
+
+    def fill(self):
+        """
+        Decides every state, e.g. before forking worker processes so they share the whole table.
+        """
+        for key in self.states():
+            if key not in self.entries:
+                self.entries[key] = self.decide(key)
+
+    def states(self):
+        """
+        Yields every valid packed state.
+        """
+        bits = self.bits
+        for cities in range(self.max_cities + 1):
+            for settlements in (0, 1):
+                for counts in range((self.clip + 1) ** len(RESOURCE_TYPES)):
+                    key = 0
+                    for _ in RESOURCE_TYPES:
+                        counts, count = divmod(counts, self.clip + 1)
+                        key = (key << bits) | count
+                    yield key | settlements << 5 * bits | cities << 5 * bits + 1
+
+    def validate(self, rules):
+        """
+        Checks the table against a rule-based decision function on every state. Each
+        state is checked as stored and with its clipped counts raised past CLIP, which
+        must not change the decision.
+
+        Args:
+            rules (callable): (inventory, settlements, cities) -> (give, receive, builds),
+                e.g. a CatanSimulation's trade_with_bank_by_rules applied to a probe player.
+
+        Returns:
+            list: (inventory, settlements, cities, table decision, rule decision) of every mismatch.
+        """
+        mismatches = []
+        for key in self.states():
+            inventory, settlements, cities = self.unpack(key)
+            raised = [count + self.clip if count == self.clip else count for count in inventory]
+            for state in ((inventory, settlements, cities), (raised, settlements * 3, cities)):
+                expected = rules(list(state[0]), state[1], state[2])
+                decision = self.lookup(*state)
+                if decision != expected:
+                    mismatches.append((list(state[0]), state[1], state[2], decision, expected))
+        return mismatches
+
+
+def get_policy_table(max_cities, settlement_cost=SETTLEMENT_COST, city_cost=CITY_COST, road_cost=ROAD_COST,
+                     trade_target=TRADE_TARGET, trade_ratio=TRADE_RATIO):
+    """
+    Returns the PolicyTable for a set of rules, creating it the first time the rules
+    are seen, so changing a cost or max_cities switches to a table of its own.
+    """
+    key = (max_cities, tuple(settlement_cost), tuple(city_cost), tuple(road_cost), tuple(trade_target), trade_ratio)
+    table = _POLICY_CACHE.get(key)
+    if table is None:
+        table = PolicyTable(*key)
+        _POLICY_CACHE[key] = table
+    return table
@@ -0,0 +1,143 @@
+"""
+Opt-in per-phase timing and event counters for CatanSimulation games.
+
+A SimulationProfile is attached to a game with CatanSimulation(..., profile=profile).
+It then wraps the game's own methods on that instance only, so games without a
+profile run the unmodified methods and pay nothing. Profiles hold plain dicts of
+numbers, so they pickle across worker processes and merge in any order.
+"""
+import time
+from collections import defaultdict
+
+# Instrumented CatanSimulation methods and the phase each one's time counts towards
+PHASES = {
+    'roll_dice': 'production',
+    'produce_resources': 'production',
+    'trade_with_bank': 'trading',
+    'choose_settlement_by_most_common_roll': 'strategy',
+    'choose_settlement_by_most_valuable_resource': 'strategy',
+    'choose_settlement_by_missing_resource': 'strategy',
+    'choose_settlement_by_expected_yield': 'strategy',
+    'choose_settlement_by_rollout': 'strategy',
+    'choose_city_location': 'strategy',
+    'choose_road_location': 'strategy',
+    'build_settlement': 'building',
+    'build_city': 'building',
+    'build_road': 'building',
+    'update_road_component': 'longest_road',
+    'calculate_victory_points': 'win_check',
+}
+
+# Event counters every report lists, even at zero
+COUNTERS = ['games', 'games_ended_early', 'trades', 'fallback_placements', 'settlements_built', 'cities_built',
+            'roads_built']
+
+
+class SimulationProfile:
+    """
+    Cumulative wall time and call counts per instrumented function and per phase,
+    plus event counters, over any number of games.
+
+    The "placement" phase is the whole settlement placement phase of run_simulation
+    and "game" is the whole of run_simulation; function times inside them also count
+    towards their own phases. While paused (e.g. during a rollout's lookahead play)
+    the timed wrappers call straight through, so that time only counts towards the
+    caller's own timing.
+    """
+
+    def __init__(self):
+        self.timings = {}  # Function or phase name: [seconds, calls]
+        self.counters = defaultdict(int)
+        self.paused = 0  # Nesting depth of pause() calls
+
+    def pause(self):
+        self.paused += 1
+
+    def resume(self):
+        self.paused -= 1
+
+    def add_time(self, name, seconds):
+        timing = self.timings.get(name)
+        if timing is None:
+            self.timings[name] = [seconds, 1]
+        else:
+            timing[0] += seconds
+            timing[1] += 1
+
+    def count(self, name, amount=1):
+        self.counters[name] += amount
+
+    def instrument(self, simulation):
+        """
+        Replaces the PHASES methods of one simulation with timed wrappers.
+
+        Args:
+            simulation (CatanSimulation): The game to instrument.
+        """
+        for name in PHASES:
+            method = getattr(simulation, name)
+            setattr(simulation, name, self.timed(name, method))
+
+    def timed(self, name, method):
+        add_time = self.add_time
+        clock = time.perf_counter
+        profile = self
+
+        def wrapper(*args, **kwargs):
+            if profile.paused:
+                return method(*args, **kwargs)
+            start = clock()
+            try:
+                return method(*args, **kwargs)
+            finally:
+                add_time(name, clock() - start)
+        return wrapper
+
+    def merge(self, other):
+        """
+        Adds another profile (e.g. from a worker process) into this one.
+        """
+        for name, (seconds, calls) in other.timings.items():
+            timing = self.timings.setdefault(name, [0.0, 0])
+            timing[0] += seconds
+            timing[1] += calls
+        for name, count in other.counters.items():
+            self.counters[name] += count
+
+    def report(self):
+        """
+        Returns the profile as a structured dict.
+
+        Returns:
+            dict: 'phases' and 'functions' map names to {'seconds', 'calls'}; 'counters'
+            maps event names to counts.
+        """
+        phases = {}
+        functions = {}
+        for name, (seconds, calls) in self.timings.items():
+            if name in PHASES:
+                functions[name] = {'seconds': seconds, 'calls': calls}
+                phase = phases.setdefault(PHASES[name], {'seconds': 0.0, 'calls': 0})
+                phase['seconds'] += seconds
+                phase['calls'] += calls
+            else:
+                phases[name] = {'seconds': seconds, 'calls': calls}
+        counters = {name: self.counters.get(name, 0) for name in COUNTERS}
+        counters.update(self.counters)
+        return {'phases': phases, 'functions': functions, 'counters': counters}
+
+    def summary(self):
+        """
+        Returns the report as printable lines, slowest first.
+        """
+        report = self.report()
+        lines = []
+        for section in ('phases', 'functions'):
+            lines.append(f"{section.capitalize()}:")
+            for name, timing in sorted(report[section].items(), key=lambda item: -item[1]['seconds']):
+                per_call = timing['seconds'] / timing['calls'] * 1e6 if timing['calls'] else 0.0
+                lines.append(f"  {name:<45} {timing['seconds']:9.3f} s {timing['calls']:>10} calls {per_call:9.2f} us/call")
+        lines.append("Counters:")
+        for name, count in report['counters'].items():
+            lines.append(f"  {name:<45} {count:>10}")
+        return lines
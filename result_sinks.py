@@ -0,0 +1,370 @@
+"""
+Per-game result records, buffered sinks that stream them to disk, and a streaming
+aggregator for the summary statistics of a batch.
+
+A record is a flat dict of integers with the keys given by record_fields(), one per game.
+"""
+import csv
+import json
+from array import array
+from statistics import NormalDist
+
+from board_topology import RESOURCE_TYPES
+
+SUMMARY_FIELDS = ['turns', 'vp', 'settlements', 'cities']  # Per-player fields summarised by ResultAggregator
+
+
+def record_fields(num_players=2):
+    """
+    Returns the column names of a game record, in file order.
+
+    Args:
+        num_players (int): The number of players in each game.
+
+    Returns:
+        list: Field names; per-player fields end in _<player>.
+    """
+    players = range(1, num_players + 1)
+    fields = ['game', 'seed']
+    fields += [f'strategy_{player}' for player in players]
+    fields += ['winner', 'turns']
+    for name in ['vp', 'settlements', 'cities'] + RESOURCE_TYPES:
+        fields += [f'{name}_{player}' for player in players]
+    return fields
+
+
+def normal_quantile(confidence):
+    """
+    Returns the two-sided standard normal quantile for a confidence level, e.g. 1.96 for 0.95.
+    """
+    return NormalDist().inv_cdf(0.5 + confidence / 2)
+
+
+def wilson_interval(successes, trials, confidence=0.95):
+    """
+    Wilson score interval for a binomial proportion such as a win rate. Unlike the
+    normal approximation it stays inside [0, 1] and behaves for rates near 0 or 1.
+
+    Args:
+        successes (int): The number of successes, e.g. wins.
+        trials (int): The number of trials, e.g. games.
+        confidence (float): The confidence level of the interval.
+
+    Returns:
+        tuple: The (low, high) bounds, or (0.0, 1.0) when there are no trials.
+    """
+    if trials == 0:
+        return 0.0, 1.0
+    z = normal_quantile(confidence)
+    rate = successes / trials
+    denominator = 1 + z * z / trials
+    centre = (rate + z * z / (2 * trials)) / denominator
+    half_width = z * (rate * (1 - rate) / trials + z * z / (4 * trials * trials)) ** 0.5 / denominator
+    return max(0.0, centre - half_width), min(1.0, centre + half_width)
+
+
+class RunningStat:
+    """
+    Count, mean, variance (Welford), min and max of a stream of numbers.
+    Two RunningStats can be merged, e.g. across worker processes.
+    """
+
+    def __init__(self):
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.min = None
+        self.max = None
+
+    def add(self, value):
+        self.count += 1
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self.m2 += delta * (value - self.mean)
+        self.min = value if self.min is None else min(self.min, value)
+        self.max = value if self.max is None else max(self.max, value)
+
+    def merge(self, other):
+        """
+        Folds another RunningStat into this one (Chan et al. parallel update).
+        """
+        if other.count == 0:
+            return
+        if self.count == 0:
+            self.count, self.mean, self.m2, self.min, self.max = other.count, other.mean, other.m2, other.min, other.max
+            return
+        count = self.count + other.count
+        delta = other.mean - self.mean
+        self.mean += delta * other.count / count
+        self.m2 += other.m2 + delta * delta * self.count * other.count / count
+        self.count = count
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+
+    @property
+    def variance(self):
+        return self.m2 / (self.count - 1) if self.count > 1 else 0.0
+
+    @property
+    def std(self):
+        return self.variance ** 0.5
+
+    def mean_interval(self, confidence=0.95):
+        """
+        Returns the (low, high) normal-approximation confidence interval of the mean.
+        """
+        if self.count < 2:
+            return float('-inf'), float('inf')
+        half_width = normal_quantile(confidence) * self.std / self.count ** 0.5
+        return self.mean - half_width, self.mean + half_width
+
+    def to_dict(self):
+        return {'count': self.count, 'mean': self.mean, 'm2': self.m2, 'min': self.min, 'max': self.max}
+
+    @classmethod
+    def from_dict(cls, data):
+        stat = cls()
+        stat.count, stat.mean, stat.m2, stat.min, stat.max = (data['count'], data['mean'], data['m2'], data['min'],
+                                                               data['max'])
+        return stat
+
+
+class ResultAggregator:
+    """
+    Streaming summary of a batch: win counts plus a RunningStat per summary field and
+    per player's buildings (settlements + cities), updated one record at a time and
+    mergeable across workers.
+    """
+
+    def __init__(self, num_players=2):
+        self.num_players = num_players
+        self.games = 0
+        self.wins = {player: 0 for player in range(num_players + 1)}  # 0 counts ties
+        self.stats = {'turns': RunningStat()}
+        for name in SUMMARY_FIELDS[1:]:
+            for player in range(1, num_players + 1):
+                self.stats[f'{name}_{player}'] = RunningStat()
+        for player in range(1, num_players + 1):
+            self.stats[f'buildings_{player}'] = RunningStat()
+
+    def add(self, record):
+        self.games += 1
+        self.wins[record['winner']] += 1
+        for field, stat in self.stats.items():
+            if field.startswith('buildings_'):
+                player = field[len('buildings_'):]
+                stat.add(record[f'settlements_{player}'] + record[f'cities_{player}'])
+            else:
+                stat.add(record[field])
+
+    def add_columns(self, columns):
+        """
+        Adds a whole batch of games given as NumPy arrays keyed by field, e.g. from the vector engine.
+        """
+        winners = columns['winner']
+        self.games += len(winners)
+        for player in self.wins:
+            self.wins[player] += int((winners == player).sum())
+        for field, stat in self.stats.items():
+            if field.startswith('buildings_'):
+                player = field[len('buildings_'):]
+                values = columns[f'settlements_{player}'] + columns[f'cities_{player}']
+            else:
+                values = columns[field]
+            if not len(values):
+                continue
+            batch = RunningStat()
+            batch.count = len(values)
+            batch.mean = float(values.mean())
+            batch.m2 = float(((values - batch.mean) ** 2).sum())
+            batch.min = int(values.min())
+            batch.max = int(values.max())
+            stat.merge(batch)
+
+    def merge(self, other):
+        self.games += other.games
+        for player, count in other.wins.items():
+            self.wins[player] += count
+        for field, stat in self.stats.items():
+            stat.merge(other.stats[field])
+
+    def win_rate(self, player):
+        return self.wins[player] / self.games if self.games else 0.0
+
+    def to_dict(self):
+        """
+        Returns the aggregator as plain JSON-compatible data, e.g. for a checkpoint file.
+        """
+        return {
+            'num_players': self.num_players,
+            'games': self.games,
+            'wins': [self.wins[player] for player in range(self.num_players + 1)],
+            'stats': {field: stat.to_dict() for field, stat in self.stats.items()},
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        """
+        Rebuilds an aggregator saved with to_dict.
+        """
+        aggregator = cls(data['num_players'])
+        aggregator.games = data['games']
+        aggregator.wins = dict(enumerate(data['wins']))
+        aggregator.stats = {field: RunningStat.from_dict(stat) for field, stat in data['stats'].items()}
+        return aggregator
+
+    def win_rate_interval(self, player, confidence=0.95):
+        """
+        Returns the Wilson (low, high) confidence interval of a player's win rate.
+        """
+        return wilson_interval(self.wins[player], self.games, confidence)
+
+    def summary(self):
+        """
+        Returns the summary as printable lines.
+        """
+        lines = [f"Games: {self.games}"]
+        for player in range(1, self.num_players + 1):
+            lines.append(f"Player {player} Win Rate: {self.win_rate(player):.2%}")
+        lines.append(f"Ties: {self.wins[0]}")
+        for field, stat in self.stats.items():
+            lines.append(f"{field}: mean {stat.mean:.2f}, std {stat.std:.2f}, min {stat.min}, max {stat.max}")
+        return lines
+
+
+class ResultSink:
+    """
+    Base class for record sinks: buffers records and writes them out in batches.
+    """
+
+    def __init__(self, path, num_players=2, buffer_size=1000):
+        self.path = path
+        self.fields = record_fields(num_players)
+        self.buffer_size = buffer_size
+        self.buffer = []
+
+    def write(self, record):
+        self.buffer.append(record)
+        if len(self.buffer) >= self.buffer_size:
+            self.flush()
+
+    def write_many(self, records):
+        for record in records:
+            self.write(record)
+
+    def flush(self):
+        if self.buffer:
+            self.write_batch(self.buffer)
+            self.buffer = []
+
+    def write_batch(self, records):
+        raise NotImplementedError
+
+    def close(self):
+        self.flush()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+
+class JsonlSink(ResultSink):
+    """
+    Writes one JSON object per line.
+    """
+
+    def __init__(self, path, num_players=2, buffer_size=1000):
+        super().__init__(path, num_players, buffer_size)
+        self.file = open(path, 'w')
+
+    def write_batch(self, records):
+        self.file.write(''.join(json.dumps({field: record[field] for field in self.fields}) + '\n'
+                                for record in records))
+
+    def close(self):
+        super().close()
+        self.file.close()
+
+
+class CsvSink(ResultSink):
+    """
+    Writes a CSV file with a header row.
+    """
+
+    def __init__(self, path, num_players=2, buffer_size=1000):
+        super().__init__(path, num_players, buffer_size)
+        self.file = open(path, 'w', newline='')
+        self.writer = csv.writer(self.file)
+        self.writer.writerow(self.fields)
+
+    def write_batch(self, records):
+        self.writer.writerows([record[field] for field in self.fields] for record in records)
+
+    def close(self):
+        super().close()
+        self.file.close()
+
+
+class NpzSink(ResultSink):
+    """
+    Keeps each field in a compact typed array and writes them as the columns of a
+    NumPy .npz file on close. NumPy is only needed at that point.
+    """
+
+    def __init__(self, path, num_players=2, buffer_size=1000):
+        super().__init__(path, num_players, buffer_size)
+        self.columns = {field: array('q') for field in self.fields}
+
+    def write_batch(self, records):
+        for field, column in self.columns.items():
+            column.extend(record[field] for record in records)
+
+    def close(self):
+        super().close()
+        import numpy as np
+        np.savez(self.path, **{field: np.frombuffer(column, dtype=np.int64) for field, column in self.columns.items()})
+
+
+class MemorySink(ResultSink):
+    """
+    Keeps every record in a list, for callers that post-process the games of a batch.
+    """
+
+    def __init__(self, path=None, num_players=2, buffer_size=1000):
+        super().__init__(path, num_players, buffer_size)
+        self.records = []
+
+    def write_batch(self, records):
+        self.records.extend(records)
+
+
+class NullSink(ResultSink):
+    """
+    Discards every record.
+    """
+
+    def __init__(self, path=None, num_players=2, buffer_size=1000):
+        super().__init__(path, num_players, buffer_size)
+
+    def write(self, record):
+        pass
+
+    def write_batch(self, records):
+        pass
+
+
+SINKS = {'.jsonl': JsonlSink, '.csv': CsvSink, '.npz': NpzSink}
+
+
+def open_sink(path, num_players=2, buffer_size=1000):
+    """
+    Opens the sink matching a file extension (.jsonl, .csv or .npz); None gives a NullSink.
+    """
+    if path is None:
+        return NullSink(num_players=num_players)
+    for extension, sink_class in SINKS.items():
+        if path.endswith(extension):
+            return sink_class(path, num_players, buffer_size)
+    raise ValueError(f"Unknown result file type: {path} (expected one of {', '.join(SINKS)})")
@@ -0,0 +1,33 @@
+"""
+Resuming run_sweep from a checkpoint file that an interruption cut off.
+"""
+from benchmarks import benchmark_board, load_simulation
+
+sim = load_simulation()
+
+PAIRINGS = [(1, 2), (2, 1), (1, 3)]
+
+
+def play(checkpoint):
+    board_layout, resource_values = benchmark_board(sim)
+    return sim.run_sweep([board_layout], {'default': resource_values}, PAIRINGS, 2, num_turns=20,
+                         checkpoint=str(checkpoint), progress=False)
+
+
+def summaries(results):
+    return {cell: summary.to_dict() for cell, summary in results.items()}
+
+
+def test_resume_twice_after_truncated_line(tmp_path):
+    checkpoint = tmp_path / "sweep.jsonl"
+    expected = summaries(play(checkpoint))
+    header, first, second, _ = checkpoint.read_text().splitlines(keepends=True)
+    checkpoint.write_text(header + first + second[:len(second) // 2])  # Interrupted while writing the second cell
+
+    assert summaries(play(checkpoint)) == expected
+    lines = checkpoint.read_text().splitlines()
+    assert len(lines) == 5  # Header, first cell, the cut-off line and the two cells played again
+
+    # The cut-off line is now in the middle of the file; the cells after it must still count
+    assert summaries(play(checkpoint)) == expected
+    assert checkpoint.read_text().splitlines() == lines  # Nothing played again
@@ -0,0 +1,280 @@
+"""
+Lockstep NumPy engine that plays a whole batch of CatanSimulation games at once.
+
+Every piece of game state is an array with the game as its first axis, so one turn of
+every game in the batch is a handful of masked array operations. The rules follow
+CatanSimulation.run_simulation with road_network=False: two starting settlements each,
+production, one 4:1 bank trade, then settlement -> city -> road, and the game ends as
+soon as a player reaches 10 victory points after a turn without a settlement or city
+build. Roads are only a resource sink, so there is no road network or Longest Road.
+
+The dice come from NumPy rather than the random module, so single games differ from
+the reference engine; batch win rates agree within sampling error.
+"""
+import numpy as np
+
+from board_topology import POPCOUNT, RESOURCE_BITS, RESOURCE_INDEX, RESOURCE_TYPES, get_board_topology, get_vertex_scores
+from yield_model import get_yield_model
+
+WOOD, BRICK, SHEEP, WHEAT, ORE = range(len(RESOURCE_TYPES))
+
+# Same rules as CatanSimulation, as (wood, brick, sheep, wheat, ore) vectors
+STARTING_HAND = np.array([2, 2, 2, 2, 0])
+SETTLEMENT_COST = np.array([1, 1, 1, 1, 0])
+CITY_COST = np.array([0, 0, 0, 2, 3])
+ROAD_COST = np.array([1, 1, 0, 0, 0])
+TRADE_TARGET = np.array([1, 1, 1, 1, 3])  # What trade_with_bank tries to cover: a settlement, plus ore for a city
+WINNING_POINTS = 10
+
+STRATEGIES = ("most_common_roll", "most_valuable_resource", "missing_resource", "expected_yield")
+
+_ENGINE_CACHE = {}  # (board contents, resource_values, num_turns): VectorizedCatan
+
+
+class GameBatch:
+    """
+    The state of every game in a batch, one row per game.
+    """
+
+    def __init__(self, num_games, num_vertices, num_players=2):
+        self.num_players = num_players
+        self.inventory = np.tile(STARTING_HAND, (num_games, num_players, 1)).astype(np.int32)  # Game, player, resource
+        self.production = np.zeros((num_games, num_players, 13, len(RESOURCE_TYPES)), dtype=np.int32)  # Per roll
+        self.blocked = np.zeros((num_games, num_vertices), dtype=bool)  # Ruled out by the distance rule
+        self.slot_vertices = np.zeros((num_games, num_players, num_vertices), dtype=np.int64)  # In build order
+        self.slot_levels = np.zeros((num_games, num_players, num_vertices), dtype=np.int8)  # 0 empty, 1 settlement, 2 city
+        self.num_slots = np.zeros((num_games, num_players), dtype=np.int64)
+        self.settlements = np.zeros((num_games, num_players), dtype=np.int64)
+        self.cities = np.zeros((num_games, num_players), dtype=np.int64)
+        self.active = np.ones(num_games, dtype=bool)
+
+    def victory_points(self, player):
+        return self.settlements[:, player] + 2 * self.cities[:, player]
+
+
+class VectorizedCatan:
+    """
+    Plays batches of games on one board with NumPy arrays indexed by game, then player.
+    """
+
+    def __init__(self, board_layout, resource_values, num_turns=100, max_cities=4):
+        """
+        Precomputes the per-vertex tables the batch engine gathers from.
+
+        Args:
+            board_layout (dict): A dictionary representing the game board.
+            resource_values (dict): A dictionary specifying the value of each resource.
+            num_turns (int): The number of turns per game.
+            max_cities (int): The maximum number of cities per player.
+        """
+        self.num_turns = num_turns
+        self.max_cities = max_cities
+        topology = get_board_topology(board_layout)
+        scores = get_vertex_scores(board_layout, topology, resource_values)
+        self.num_vertices = topology.num_vertices
+
+        # Vertex x dice number -> resources produced by a settlement there (a city doubles it)
+        self.yield_table = np.zeros((self.num_vertices, 13, len(RESOURCE_TYPES)), dtype=np.int32)
+        for vertex, tiles in enumerate(topology.vertex_tiles):
+            for tile_coords in tiles:
+                tile = board_layout[tile_coords]
+                if tile['resource'] != 'desert':
+                    self.yield_table[vertex, tile['number'], RESOURCE_INDEX[tile['resource']]] += 1
+        self.yield_table[:, 7] = 0  # A 7 never produces
+
+        self.block_masks = np.zeros((self.num_vertices, self.num_vertices), dtype=bool)
+        for vertex, neighbours in enumerate(topology.vertex_neighbours):
+            self.block_masks[vertex, vertex] = True
+            self.block_masks[vertex, list(neighbours)] = True
+
+        self.orders = {
+            "most_common_roll": np.array(scores.common_roll_order),
+            "most_valuable_resource": np.array(scores.resource_value_order),
+            "expected_yield": np.array(get_yield_model(board_layout, topology).value_order(resource_values)),
+        }
+        self.resource_masks = np.array(scores.resource_masks)
+        self.popcount = np.array(POPCOUNT)
+
+        # missing_resource looks at every resource_values key; anything outside the inventory
+        # (the desert) always has a count of 0 and so is always "missing"
+        self.resource_bits = np.array([RESOURCE_BITS[resource] for resource in RESOURCE_TYPES])
+        self.tracked = np.array([resource in resource_values for resource in RESOURCE_TYPES])
+        self.always_missing = 0
+        for resource in resource_values:
+            if resource not in RESOURCE_INDEX:
+                self.always_missing |= RESOURCE_BITS.get(resource, 0)
+
+    def run(self, num_games, strategies, rng):
+        """
+        Plays a batch of games.
+
+        Args:
+            num_games (int): The number of games to play.
+            strategies (tuple): Strategy names of the players in seat order, from STRATEGIES.
+            rng (numpy.random.Generator): The source of dice rolls and fallback choices.
+
+        Returns:
+            dict: Per-game arrays: 'victory_points', 'settlements', 'cities' (games x players),
+            'inventory' (games x players x resources), 'dice' (games x turns) and 'turns_played'.
+        """
+        for strategy in strategies:
+            if strategy not in STRATEGIES:
+                raise ValueError(f"Invalid strategy: {strategy}")
+
+        games = GameBatch(num_games, self.num_vertices, len(strategies))
+        game_index = np.arange(num_games)
+        # Rolled before anything else, so the dice depend only on the generator's seed (common random numbers)
+        dice = rng.integers(1, 7, size=(num_games, self.num_turns)) + rng.integers(1, 7, size=(num_games, self.num_turns))
+        turns_played = np.full(num_games, self.num_turns)
+
+        # 1. Settlement Placement Phase
+        for player, strategy in enumerate(strategies):
+            for _ in range(2):
+                locations = self.choose_settlements(games, game_index, player, strategy, rng)
+                fallback = ~games.blocked
+                locations = np.where(locations >= 0, locations,
+                                     np.where(fallback.any(axis=1), fallback.argmax(axis=1), -1))
+                self.build_settlements(games, game_index, player, locations)
+
+        # 2. Resource Production and Expansion Phase
+        for turn in range(self.num_turns):
+            if not games.active.any():
+                break
+            games.inventory += games.production[game_index, :, dice[:, turn]] * games.active[:, None, None]
+
+            for player, strategy in enumerate(strategies):
+                self.trade_with_bank(games, player)
+
+                build_settlement = games.active & self.can_build_settlement(games, player)
+                building = np.nonzero(build_settlement)[0]
+                if building.size:
+                    locations = self.choose_settlements(games, building, player, strategy, rng)
+                    self.build_settlements(games, building, player, locations)
+
+                build_city = games.active & ~build_settlement & self.can_build_city(games, player)
+                self.build_cities(games, player, build_city)
+
+                # Only players that built neither a settlement nor a city go on to roads and the win check
+                rest = games.active & ~build_settlement & ~build_city
+                inventory = games.inventory[:, player]
+                build_road = rest & (inventory[:, WOOD] >= 1) & (inventory[:, BRICK] >= 1)
+                inventory[build_road] -= ROAD_COST
+
+                won = rest & (games.victory_points(player) >= WINNING_POINTS)
+                turns_played[won] = turn + 1
+                games.active &= ~won
+
+        return {
+            'victory_points': np.stack([games.victory_points(player) for player in range(games.num_players)], axis=1),
+            'settlements': games.settlements,
+            'cities': games.cities,
+            'inventory': games.inventory,
+            'dice': dice,
+            'turns_played': turns_played,
+        }
+
+    def can_build_settlement(self, games, player):
+        return (games.inventory[:, player, :WHEAT + 1] >= 1).all(axis=1)
+
+    def can_build_city(self, games, player):
+        inventory = games.inventory[:, player]
+        return ((inventory[:, WHEAT] >= 2) & (inventory[:, ORE] >= 3) & (games.settlements[:, player] > 0)
+                & (games.cities[:, player] < self.max_cities))
+
+    def trade_with_bank(self, games, player):
+        """
+        Vectorized CatanSimulation.trade_with_bank: players who cannot build trade the first
+        resource they hold 4 of (and do not need) for the first resource they are short of.
+        """
+        needs_trade = games.active & ~self.can_build_settlement(games, player) & ~self.can_build_city(games, player)
+        inventory = games.inventory[:, player]
+        missing = inventory < TRADE_TARGET
+        spare = (inventory >= 4) & ~missing
+        trading = np.nonzero(needs_trade & spare.any(axis=1) & missing.any(axis=1))[0]
+        if trading.size:
+            games.inventory[trading, player, spare[trading].argmax(axis=1)] -= 4
+            games.inventory[trading, player, missing[trading].argmax(axis=1)] += 1
+
+    def choose_settlements(self, games, building, player, strategy, rng):
+        """
+        Vectorized settlement strategies: a masked arg-max over each game's open vertices.
+
+        Args:
+            games (GameBatch): The batch state.
+            building (numpy.ndarray): Indices of the games where the player places a settlement.
+            player (int): The player index.
+            strategy (str): The player's strategy name.
+            rng (numpy.random.Generator): Source of the missing_resource fallback choices.
+
+        Returns:
+            numpy.ndarray: The chosen vertex per building game, -1 where the board is full.
+        """
+        open_vertices = ~games.blocked[building]
+        if strategy in self.orders:
+            order = self.orders[strategy]
+            open_in_order = open_vertices[:, order]
+            first_open = order[open_in_order.argmax(axis=1)]
+            return np.where(open_in_order.any(axis=1), first_open, -1)
+
+        # missing_resource: most different missing resources, first vertex ID on ties
+        missing = ((games.inventory[building, player] == 0) & self.tracked) @ self.resource_bits | self.always_missing
+        scores = self.popcount[self.resource_masks[None, :] & missing[:, None]]
+        scores[~open_vertices] = -1
+        best = scores.argmax(axis=1)
+        best_scores = scores[np.arange(len(best)), best]
+        locations = np.where(best_scores > 0, best, -1)
+
+        # No open vertex touches a missing resource: pick any open one at random
+        fallback = best_scores == 0
+        if fallback.any():
+            keys = rng.random(open_vertices.shape)
+            keys[~open_vertices] = -1.0
+            locations = np.where(fallback, keys.argmax(axis=1), locations)
+        return locations
+
+    def build_settlements(self, games, building, player, locations):
+        placed = locations >= 0
+        building = building[placed]
+        if not building.size:
+            return
+        vertices = locations[placed]
+        games.inventory[building, player] -= SETTLEMENT_COST
+        games.blocked[building] |= self.block_masks[vertices]
+        games.production[building, player] += self.yield_table[vertices]
+        slots = games.num_slots[building, player]
+        games.slot_vertices[building, player, slots] = vertices
+        games.slot_levels[building, player, slots] = 1
+        games.num_slots[building, player] += 1
+        games.settlements[building, player] += 1
+
+    def build_cities(self, games, player, mask):
+        """
+        Upgrades each building player's first settlement, like CatanSimulation.choose_city_location.
+        """
+        building = np.nonzero(mask)[0]
+        if not building.size:
+            return
+        slots = (games.slot_levels[building, player] == 1).argmax(axis=1)
+        vertices = games.slot_vertices[building, player, slots]
+        games.slot_levels[building, player, slots] = 2
+        games.inventory[building, player] -= CITY_COST
+        games.production[building, player] += self.yield_table[vertices]  # Cities produce 2
+        games.settlements[building, player] -= 1
+        games.cities[building, player] += 1
+
+
+def get_vectorized_catan(board_layout, resource_values, num_turns=100):
+    """
+    Returns the VectorizedCatan for a board, resource_values and game length, building
+    its tables only the first time they are seen (batches are stateless, so engines are shared).
+    """
+    key = (
+        tuple(sorted((coords, tile['resource'], tile['number']) for coords, tile in board_layout.items())),
+        tuple(sorted(resource_values.items())),
+        num_turns,
+    )
+    engine = _ENGINE_CACHE.get(key)
+    if engine is None:
+        engine = VectorizedCatan(board_layout, resource_values, num_turns)
+        _ENGINE_CACHE[key] = engine
+    return engine
@@ -0,0 +1,193 @@
+"""
+Exact expected resource yields of board vertices and settlement placements.
+
+Everything here follows from the two-dice distribution and the tiles around each
+vertex (BoardTopology.vertex_tiles, i.e. the on-board tiles of get_connected_tiles),
+so it answers in milliseconds what the batch runs estimate from dice tallies. Models
+are built once per board and memoize their per-placement results.
+"""
+from board_topology import RESOURCE_INDEX, RESOURCE_TYPES, get_board_topology
+
+# Probability of each two-dice total
+DICE_PROBABILITY = {roll: (6 - abs(roll - 7)) / 36 for roll in range(2, 13)}
+
+_YIELD_MODEL_CACHE = {}  # Board contents: YieldModel
+
+
+class YieldModel:
+    """
+    Per-roll production of every vertex of a board, and the exact yield statistics
+    derived from it. Yields are tuples in RESOURCE_TYPES order.
+
+    A placement is an iterable of (vertex, level) pairs like CatanSimulation.settlements[player],
+    with level 1 for a settlement and 2 for a city.
+    """
+
+    def __init__(self, board_layout, topology):
+        """
+        Tabulates what every vertex produces on every roll.
+
+        Args:
+            board_layout (dict): A dictionary representing the game board.
+            topology (BoardTopology): The vertex graph of the board.
+        """
+        self.num_vertices = topology.num_vertices
+        self.roll_yields = []  # Vertex: {roll: yield of a settlement there}, rolls that produce nothing left out
+        for tiles in topology.vertex_tiles:
+            yields = {}
+            for tile_x, tile_y in tiles:
+                tile = board_layout[(tile_x, tile_y)]
+                if tile['resource'] == 'desert' or tile['number'] == 7:  # Neither ever produces
+                    continue
+                counts = yields.setdefault(tile['number'], [0] * len(RESOURCE_TYPES))
+                counts[RESOURCE_INDEX[tile['resource']]] += 1
+            self.roll_yields.append({roll: tuple(counts) for roll, counts in yields.items()})
+        self._moment_cache = {}  # Placement key: (means, variances)
+        self._probability_cache = {}  # (placement key, cost, turns, inventory): probabilities
+        self._value_orders = {}  # resource_values key: vertices best-first
+        self.vertex_moments = [self.placement_moments(((vertex, 1),)) for vertex in range(self.num_vertices)]
+
+    def placement_rolls(self, placement):
+        """
+        Combines the per-roll yields of a placement.
+
+        Args:
+            placement (iterable): (vertex, level) pairs.
+
+        Returns:
+            dict: {roll: yield} of the rolls on which the placement produces.
+        """
+        combined = {}
+        for vertex, level in placement:
+            for roll, counts in self.roll_yields[vertex].items():
+                total = combined.get(roll, (0,) * len(RESOURCE_TYPES))
+                combined[roll] = tuple(total_count + level * count for total_count, count in zip(total, counts))
+        return combined
+
+    def placement_moments(self, placement):
+        """
+        Returns the exact per-turn mean and variance of each resource a placement produces.
+        Buildings on the same number are perfectly correlated, which the per-roll
+        combination accounts for.
+
+        Args:
+            placement (iterable): (vertex, level) pairs.
+
+        Returns:
+            tuple: (means, variances), each a tuple in RESOURCE_TYPES order.
+        """
+        key = tuple(sorted(placement))
+        if key in self._moment_cache:
+            return self._moment_cache[key]
+        means = [0.0] * len(RESOURCE_TYPES)
+        squares = [0.0] * len(RESOURCE_TYPES)
+        for roll, counts in self.placement_rolls(key).items():
+            probability = DICE_PROBABILITY[roll]
+            for index, count in enumerate(counts):
+                means[index] += probability * count
+                squares[index] += probability * count * count
+        moments = (tuple(means), tuple(square - mean * mean for square, mean in zip(squares, means)))
+        self._moment_cache[key] = moments
+        return moments
+
+    def expected_yield(self, vertex):
+        """
+        Returns the expected per-turn yield of a settlement on a vertex.
+        """
+        return self.vertex_moments[vertex][0]
+
+    def yield_variance(self, vertex):
+        """
+        Returns the per-turn variance of each resource a settlement on a vertex yields.
+        """
+        return self.vertex_moments[vertex][1]
+
+    def build_probability(self, placement, cost, turns, inventory=None):
+        """
+        Probability that a placement's production covers a build cost within k turns, for
+        every k up to turns. Exact: the distribution of the (capped) resources collected
+        is convolved with the per-turn yield distribution once per turn. Trades and
+        spending are not modelled.
+
+        Args:
+            placement (iterable): (vertex, level) pairs.
+            cost (dict): Resource: amount needed, e.g. {'wheat': 2, 'ore': 3}.
+            turns (int): The number of turns to look ahead.
+            inventory (list): Resources already held, in RESOURCE_TYPES order. None starts from nothing.
+
+        Returns:
+            list: Probabilities for 1, 2, ..., turns turns.
+        """
+        key = tuple(sorted(placement))
+        target = tuple(cost.get(resource, 0) for resource in RESOURCE_TYPES)
+        start = tuple(min(held, needed) for held, needed in zip(inventory or (0,) * len(RESOURCE_TYPES), target))
+        cache_key = (key, target, turns, start)
+        if cache_key in self._probability_cache:
+            return self._probability_cache[cache_key]
+
+        # Distinct per-turn outcomes, capped at the cost; a 7 and unmatched numbers yield nothing
+        outcomes = {}
+        no_yield = 1.0
+        for roll, counts in self.placement_rolls(key).items():
+            capped = tuple(min(count, needed) for count, needed in zip(counts, target))
+            outcomes[capped] = outcomes.get(capped, 0.0) + DICE_PROBABILITY[roll]
+            no_yield -= DICE_PROBABILITY[roll]
+        zero = (0,) * len(RESOURCE_TYPES)
+        outcomes[zero] = outcomes.get(zero, 0.0) + no_yield
+
+        distribution = {start: 1.0}
+        probabilities = []
+        for _ in range(turns):
+            next_distribution = {}
+            for state, state_probability in distribution.items():
+                if state == target:  # Covered states stay covered
+                    next_distribution[state] = next_distribution.get(state, 0.0) + state_probability
+                    continue
+                for counts, probability in outcomes.items():
+                    new_state = tuple(min(held + count, needed) for held, count, needed in zip(state, counts, target))
+                    next_distribution[new_state] = next_distribution.get(new_state, 0.0) + state_probability * probability
+            distribution = next_distribution
+            probabilities.append(distribution.get(target, 0.0))
+        self._probability_cache[cache_key] = probabilities
+        return probabilities
+
+    def value_order(self, resource_values):
+        """
+        Returns every vertex best-first by expected yield weighted with resource_values
+        (ties keep vertex ID order), for use as a settlement strategy's scoring.
+
+        Args:
+            resource_values (dict): A dictionary specifying the value of each resource.
+
+        Returns:
+            list: Vertex IDs.
+        """
+        key = tuple(sorted(resource_values.items()))
+        order = self._value_orders.get(key)
+        if order is None:
+            weights = [resource_values.get(resource, 0) for resource in RESOURCE_TYPES]
+            scores = [sum(weight * mean for weight, mean in zip(weights, self.expected_yield(vertex)))
+                      for vertex in range(self.num_vertices)]
+            order = sorted(range(self.num_vertices), key=lambda vertex: -scores[vertex])
+            self._value_orders[key] = order
+        return order
+
+
+def get_yield_model(board_layout, topology=None):
+    """
+    Returns the YieldModel for a board, building it only the first time the board's
+    tiles and numbers are seen.
+
+    Args:
+        board_layout (dict): A dictionary representing the game board.
+        topology (BoardTopology): The vertex graph of the board; looked up if omitted.
+
+    Returns:
+        YieldModel: The shared model for the board.
+    """
+    key = tuple(sorted((coords, tile['resource'], tile['number']) for coords, tile in board_layout.items()))
+    model = _YIELD_MODEL_CACHE.get(key)
+    if model is None:
+        model = YieldModel(board_layout, topology or get_board_topology(board_layout))
+        _YIELD_MODEL_CACHE[key] = model
+    return model